@@ -0,0 +1,61 @@
+"""
+Benchmark for Graph.add_node
+
+Times add_node in fixed-size blocks while the graph grows
+With incremental validation the cost per node should stay flat
+
+Usage:
+    python benchmarks/bench_add_node.py [total_nodes] [block]
+"""
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import graph as gr  # noqa: E402
+
+
+def run(total, block, incremental=True):
+    """
+    Adds total nodes to an empty graph, timing each block of additions
+
+    Args:
+        total (int): Number of nodes to add
+        block (int): Number of nodes timed together
+        incremental (bool, optional): Graph.incremental_validation. Defaults to True.
+
+    Returns:
+        list: (graph size, microseconds per add_node) for each block
+    """
+    gr.Graph.incremental_validation = incremental
+    graph = gr.Graph()
+    rows = []
+    while graph.size < total:
+        start = time.perf_counter()
+        for _ in range(block):
+            graph.add_node()
+        elapsed = time.perf_counter() - start
+        rows.append((graph.size, elapsed / block * 1e6))
+    return rows
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    block = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'size':>10} {'us/add_node':>12}")
+    for size, cost in run(total, block):
+        print(f"{size:>10} {cost:>12.2f}")
+
+    # Legacy full check, kept small since it is quadratic
+    print("\nincremental_validation = False")
+    print(f"{'size':>10} {'us/add_node':>12}")
+    for size, cost in run(2_000, 500, incremental=False):
+        print(f"{size:>10} {cost:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
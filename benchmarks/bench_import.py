@@ -0,0 +1,69 @@
+"""
+Benchmark for cold import of graph.py
+
+Imports graph in fresh interpreters, from an empty working directory,
+and reports import time. Also checks that importing has no side effects:
+nothing printed and no files created
+
+Usage:
+    python benchmarks/bench_import.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PACKAGE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                           os.pardir))
+
+# numpy is imported first, so its own cost is reported apart
+SNIPPET = f"""
+import sys, time
+sys.path.insert(0, {PACKAGE_DIR!r})
+start = time.perf_counter()
+import numpy
+middle = time.perf_counter()
+import graph
+end = time.perf_counter()
+sys.stderr.write(f"{{middle - start}} {{end - middle}}")
+"""
+
+
+def run_once(workdir):
+    """
+    Imports graph once in a fresh interpreter
+
+    Args:
+        workdir (str): Working directory of the interpreter
+
+    Returns:
+        (float, float, str): numpy import seconds, graph import seconds, stdout
+    """
+    result = subprocess.run([sys.executable, "-c", SNIPPET], cwd=workdir,
+                            capture_output=True, text=True, check=True)
+    numpy_time, graph_time = map(float, result.stderr.split()[-2:])
+    return numpy_time, graph_time, result.stdout
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    numpy_times, graph_times = [], []
+    with tempfile.TemporaryDirectory() as workdir:
+        for _ in range(runs):
+            numpy_time, graph_time, stdout = run_once(workdir)
+            numpy_times.append(numpy_time)
+            graph_times.append(graph_time)
+            if stdout:
+                print(f"Import printed: {stdout!r}")
+        leftovers = os.listdir(workdir)
+        if leftovers:
+            print(f"Import created files: {leftovers}")
+
+    print(f"{'runs':>6} {'numpy ms':>10} {'graph ms':>10}")
+    print(f"{runs:>6} {statistics.median(numpy_times) * 1e3:>10.2f} "
+          f"{statistics.median(graph_times) * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
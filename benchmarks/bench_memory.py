@@ -0,0 +1,59 @@
+"""
+Memory benchmark for graphs built through Builder.adj_list
+
+Reports bytes per node, measured on a graph without edges, and bytes per
+edge, measured as the extra memory of the same graph with random edges
+
+Usage:
+    python benchmarks/bench_memory.py [nodes] [edges_per_node]
+"""
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import graph as gr  # noqa: E402
+
+
+def measure(adj_list):
+    """
+    Builds a graph from adj_list, tracing allocated memory
+
+    Args:
+        adj_list (list): Source adjacency list
+
+    Returns:
+        (Graph, int): Built graph and bytes it holds
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    graph = gr.Builder.adj_list(adj_list)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return graph, after - before
+
+
+def main():
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    per_node = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    # Type checks are not what is measured here
+    gr.VALIDATION = 'off'
+
+    random.seed(0)
+    empty = [[] for _ in range(nodes)]
+    connected = [[(random.randrange(nodes), 1) for _ in range(per_node)]
+                 for _ in range(nodes)]
+    num_edges = sum(len(set(j for j, _ in line)) for line in connected)
+
+    _, empty_bytes = measure(empty)
+    _, connected_bytes = measure(connected)
+
+    print(f"{'nodes':>10} {'edges':>10} {'bytes/node':>11} {'bytes/edge':>11}")
+    print(f"{nodes:>10} {num_edges:>10} {empty_bytes / nodes:>11.1f} "
+          f"{(connected_bytes - empty_bytes) / num_edges:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
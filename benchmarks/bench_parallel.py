@@ -0,0 +1,61 @@
+"""
+Benchmark for Parallel multi-source algorithms
+
+Runs Parallel.dijkstra and Parallel.hops from the same sources with 1, 2,
+4 and 8 workers, next to the serial Paths.dijkstra_batch
+
+Usage:
+    python benchmarks/bench_parallel.py [nodes] [edges] [sources]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import graph as gr  # noqa: E402
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main():
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    edges = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    count = int(sys.argv[3]) if len(sys.argv) > 3 else 256
+    gr.VALIDATION = 'fast'
+
+    rng = np.random.default_rng(0)
+    graph = gr.Graph()
+    graph.add_nodes(nodes)
+    graph.add_edges(rng.integers(0, nodes, edges),
+                    rng.integers(0, nodes, edges),
+                    rng.integers(1, 10, edges))
+    frozen = graph.freeze()
+    sources = rng.choice(nodes, count, replace=False).tolist()
+
+    serial, expected = timed(lambda: gr.Paths.dijkstra_batch(frozen, sources))
+    print(f"{nodes} nodes, {edges} edges, {count} sources, "
+          f"{os.cpu_count()} cpus")
+    print(f"{'algorithm':<12} {'workers':>7} {'seconds':>9} {'speedup':>8}")
+    print(f"{'dijkstra':<12} {'serial':>7} {serial:>9.3f} {1:>8.2f}")
+    for name, run in (("dijkstra", gr.Parallel.dijkstra),
+                      ("hops", gr.Parallel.hops)):
+        base = None
+        for workers in (1, 2, 4, 8):
+            seconds, result = timed(lambda: run(frozen, sources,
+                                                workers=workers))
+            if name == "dijkstra":
+                assert np.array_equal(result, expected)
+            base = base or seconds
+            print(f"{name:<12} {workers:>7} {seconds:>9.3f} "
+                  f"{base / seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark for Graph traversals
+
+Compares Graph.bfs / Graph.dfs and their FrozenGraph versions against
+naive versions: a BFS using a list as queue and a recursive DFS
+
+Usage:
+    python benchmarks/bench_traversal.py [nodes] [edges]
+"""
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import graph as gr  # noqa: E402
+
+
+def naive_bfs(graph, source):
+    visited = {source}
+    queue = [source]
+    order = []
+    while queue:
+        id = queue.pop(0)
+        order.append(id)
+        for target in graph.nodes[id].edges:
+            if target not in visited:
+                visited.add(target)
+                queue.append(target)
+    return order
+
+
+def naive_dfs(graph, source, visited=None, order=None):
+    if visited is None:
+        visited, order = set(), []
+    visited.add(source)
+    order.append(source)
+    for target in graph.nodes[source].edges:
+        if target not in visited:
+            naive_dfs(graph, target, visited, order)
+    return order
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main():
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    edges = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    gr.VALIDATION = 'fast'
+
+    rng = np.random.default_rng(0)
+    graph = gr.Graph()
+    graph.add_nodes(nodes)
+    graph.add_edges(rng.integers(0, nodes, edges),
+                    rng.integers(0, nodes, edges))
+    frozen = graph.freeze()
+    frozen._row_lists()
+
+    # Recursive DFS may go as deep as the graph is large
+    sys.setrecursionlimit(nodes + 1_000)
+    threading.stack_size(512 * 1024 * 1024)
+    recursive = {}
+    thread = threading.Thread(target=lambda: recursive.update(
+        result=timed(lambda: naive_dfs(graph, 0))))
+    thread.start()
+    thread.join()
+
+    runs = [
+        ("naive bfs (list queue)", timed(lambda: naive_bfs(graph, 0))),
+        ("Graph.bfs", timed(lambda: list(graph.bfs(0)))),
+        ("FrozenGraph.bfs", timed(lambda: list(frozen.bfs(0)))),
+        ("naive dfs (recursive)", recursive["result"]),
+        ("Graph.dfs", timed(lambda: list(graph.dfs(0)))),
+        ("FrozenGraph.dfs", timed(lambda: list(frozen.dfs(0)))),
+        ("Graph.bfs, first 10", timed(
+            lambda: [id for id, _ in zip(graph.bfs(0), range(10))])),
+    ]
+    print(f"{nodes} nodes, {edges} edges")
+    print(f"{'traversal':<24} {'seconds':>9} {'visited':>9}")
+    for name, (seconds, order) in runs:
+        print(f"{name:<24} {seconds:>9.4f} {len(order):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,16 @@ import warnings
 import time
 import copy
 import os
+import collections
+import heapq
+import contextlib
+import functools
+import threading
+import itertools
+import gzip
+import json
+import pickle
 
-# Needed for type checking
-from typeguard import check_type
 import numpy as np
 import numpy.typing as npt
 
@@ -16,17 +23,32 @@ import numpy.typing as npt
 MERCILESS = True
 # # Writes graph on log whenever there is a change
 VERBOSE = False
+# # Type checks: 'off' (none), 'fast' (isinstance) or 'full' (typeguard)
+# # Graphs may override it with their own level
+VALIDATION = 'full'
+VALIDATION_LEVELS = ('off', 'fast', 'full')
+# # Id allocation: 'increment' (last_id + 1) or 'reuse' (smallest removed id)
+ID_POLICIES = ('increment', 'reuse')
+# # Distance of unreachable nodes
+INF = float('inf')
+
+# Binary format configs (Converter.to_binary / Builder.from_binary)
+BINARY_FORMAT = "graphpy-csr"
+BINARY_VERSION = 1
+BINARY_FILES = {'meta': "meta.json",
+                'ids': "ids.npy",
+                'indptr': "indptr.npy",
+                'indices': "indices.npy",
+                'weights': "weights.npy",
+                'nodes': "nodes.pkl"}
 
 # Log configs
-log_date = str(time.strftime("%d-%m-%y %H:%M:%S"))
+# # Logging is opt-in. Call start_log() to write a session log file
 log_dir = "logs/"
-log_name = f"graphlog {log_date}.log"
-print(f"Session log started at {log_dir}{log_name}")
-
-# Warning configs
-warnings.simplefilter("always")
+logger = logging.getLogger("graphpy")
+logger.addHandler(logging.NullHandler())
 
-# Import warning
+# Import warning. Hidden unless ImportWarnings are enabled (e.g. python -W)
 warning = f" This library is a work in progress and may work unexpectedly"
 
 warnings.warn(warning, ImportWarning)
@@ -35,17 +57,38 @@ warnings.warn(warning, ImportWarning)
 
 
 # Sets up log
-def start_log():
+def start_log(directory: str = None, level: int = logging.DEBUG):
     """
-    Sets up log when import is made
+    Sets up a session log file, named after the current time
+    Nothing is written to disk unless this is called
+
+    Args:
+        directory (str, optional): Log folder. Defaults to log_dir.
+        level (int, optional): Logging level. Defaults to logging.DEBUG.
+
+    Returns:
+        str: Path of the log file
     """
-    if not os.path.exists(log_dir):
-        os.mkdir(log_dir)
-    logging.basicConfig(format='%(asctime)s - %(levelname)s - %(message)s',
-                        datefmt="%d-%m-%y %H:%M:%S",
-                        filename=f"{log_dir}{log_name}",
-                        # filename=f"{log_dir}testlog.log",
-                        filemode='w', level=logging.DEBUG)
+    if directory is None:
+        directory = log_dir
+    if not os.path.exists(directory):
+        os.mkdir(directory)
+    log_date = str(time.strftime("%d-%m-%y %H:%M:%S"))
+    log_path = os.path.join(directory, f"graphlog {log_date}.log")
+    handler = logging.FileHandler(log_path, mode='w')
+    handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(levelname)s - %(message)s',
+        datefmt="%d-%m-%y %H:%M:%S"))
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    return log_path
+
+
+# Needed for type checking
+# typeguard is slow to import, so it is only loaded on the first full check
+def check_type(argname, value, expected_type):
+    from typeguard import check_type as typeguard_check_type
+    return typeguard_check_type(argname, value, expected_type)
 
 
 # Handles errors and warning messages
@@ -76,47 +119,110 @@ def error_handler(message, type):
         error = KeyError
         warning = RuntimeWarning
 
+    if type == 'Value':
+        error = ValueError
+        warning = RuntimeWarning
+
     warnings.warn(message, warning)
-    logging.warning(f" <'{type}Error'> {message}")
+    logger.warning(f" <'{type}Error'> {message}")
     if MERCILESS:
-        logging.error(f" <'merciless == True'> Execution stopped")
+        logger.error(f" <'merciless == True'> Execution stopped")
         raise error(message)
         ...
 
-# Sets up log when import is made
+# =============================================================================
+
+
+# Read-only empty edge list, shared by every node without edges
+class _EmptyEdges(dict):
+    """
+    Empty edge list shared by nodes without edges, saving one dict per node
+    Any attempt to change it raises TypeError. Use Node._own_edges() first
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Shared empty edges are read-only. "
+                        "Call Node._own_edges() before changing them")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    update = setdefault = pop = popitem = clear = _read_only
 
+    # Copies and pickles resolve back to the shared instance
+    def __reduce__(self):
+        return "EMPTY_EDGES"
 
-def start_log():
-    if not os.path.exists(log_dir):
-        os.mkdir(log_dir)
-    logging.basicConfig(format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                        datefmt="%d-%m-%y %H:%M:%S",
-                        filename=f"{log_dir}{log_name}",
-                        filemode='w', level=logging.DEBUG)
 
-# Start classes
+EMPTY_EDGES = _EmptyEdges()
 
 
-def start_classes():
+# Node class. Creates node objects with data, flag and edges
+class Node():
     """
-    Start essential auxiliary classes at import
+    Node class
+    Creates node objects with data, flag and edges
+    Slotted, so nodes carry no per-instance __dict__
+    Nodes without edges share the read-only EMPTY_EDGES until an edge is
+    added. Graph methods handle this. Code writing to node.edges directly
+    should call _own_edges() first
     """
-    Type()
-    Validator()
-    Node()
-    Converter()
-    Builder()
 
-# Starts essential auxiliary classes
+    __slots__ = ('data', 'flag', 'edges')
+
+    def __init__(self,
+                 data: Type.datatype = None,
+                 flag: Type.flagtype = None,
+                 edges: Type.edgelisttype = None):
+        """
+        Initializes a node
+
+        Args:
+            data (Type.datatype, optional): Internal node data. Defaults to None.
+            flag (Type.flagtype, optional): Node flag. Defaults to None.
+            edges (Type.edgelisttype, optional): Node edges. Defaults to None.
+        """
+        # your object
+        self.data = data
+        # int, float or str. May be used for node markings
+        self.flag = flag
+        # Dict{id : weight}
+        # Check and attribution necessary due to dictionary particulars
+        if edges == None:
+            edges = EMPTY_EDGES
+        self.edges = edges
+
+    def __len__(self):
+        return len(self.edges)
+
+    # Replaces shared empty edges with a dict of its own
+    def _own_edges(self):
+        """
+        Makes sure node.edges is a dict owned by this node
+
+        Returns:
+            Type.edgelisttype: Node edges, safe to change
+        """
+        if self.edges is EMPTY_EDGES:
+            self.edges = {}
+        return self.edges
+
+    def set_data(self, data: Type.datatype):
+        raise NotImplementedError
+
+    def get_data(self):
+        raise NotImplementedError
+
+    def set_flag(self, flag: Type.flagtype):
+        raise NotImplementedError
 
+    def get_flag(self):
+        raise NotImplementedError
 
-def start_classes():
-    Type()
-    Validator()
-    Node()
+    def set_edges(self):
+        raise NotImplementedError
 
 # =============================================================================
 
+
 # Type class. Determines lib specific data types. Used in type checks
 
 
@@ -131,28 +237,61 @@ class Type():
     Returns:
         Bool: Whether input is of predetermined type
     """
-    @classmethod
-    def __init__(cls):
-        cls.idtype = int
-        cls.datatype = Any
-        cls.flagtype = Union[int, float, str]
-        cls.nodetype = Node
-        cls.weighttype = Union[int, float]
-        cls.nodelisttype = Dict[cls.idtype, cls.nodetype]
-        cls.edgelisttype = Dict[cls.idtype, cls.weighttype]
+    idtype = int
+    datatype = Any
+    flagtype = Union[int, float, str]
+    nodetype = Node
+    weighttype = Union[int, float]
+    nodelisttype = Dict[idtype, nodetype]
+    edgelisttype = Dict[idtype, weighttype]
+
+    adjmatrixtype = Union[List[List[Union[weighttype, None]]],
+                          npt.NDArray[npt.NDArray[Union[weighttype, None]]]]
+
+    adjlisttype = Union[List[List[Tuple[idtype, weighttype]]],
+                        npt.NDArray[npt.NDArray[Tuple[idtype, weighttype]]]]
+
+    adjdicttype = Dict[idtype, Union[edgelisttype, None]]
 
-        cls.adjmatrixtype = Union[List[List[Union[cls.weighttype, None]]],
-                                  npt.NDArray[npt.NDArray[Union[cls.weighttype, None]]]]
+    # isinstance equivalents of the types above, used by the 'fast' level
+    fast_idtype = int
+    fast_flagtype = (int, float, str)
+    fast_weighttype = (int, float)
 
-        cls.adjlisttype = Union[List[List[Tuple[cls.idtype, cls.weighttype]]],
-                                npt.NDArray[npt.NDArray[Tuple[cls.idtype, cls.weighttype]]]]
+    @ staticmethod
+    def get_level(level: str = None):
+        """
+        Resolves a validation level, falling back to the global VALIDATION
+
+        Args:
+            level (str, optional): 'off', 'fast' or 'full'. Defaults to VALIDATION.
 
-        cls.adjdicttype = Dict[cls.idtype, Union[cls.edgelisttype, None]]
+        Returns:
+            str: Validation level
+        """
+        if level is None:
+            level = VALIDATION
+        if level not in VALIDATION_LEVELS:
+            error_handler(f"Validation level must be one of {VALIDATION_LEVELS}",
+                          "Value")
+        return level
+
+    # Plain isinstance check, used by the 'fast' level
+    @ staticmethod
+    def _fast_check(value, types):
+        if not isinstance(value, types):
+            raise TypeError
 
     @ classmethod
-    def is_id(cls, id):
+    def is_id(cls, id, level=None):
+        level = cls.get_level(level)
+        if level == 'off':
+            return True
         try:
-            check_type("id", id, cls.idtype)
+            if level == 'fast':
+                cls._fast_check(id, cls.fast_idtype)
+            else:
+                check_type("id", id, cls.idtype)
             if not id >= 0:
                 error_handler("Id out of bounds", "Key")
             return True
@@ -161,66 +300,108 @@ class Type():
             return False
 
     @ classmethod
-    def is_data(cls, data):
+    def is_data(cls, data, level=None):
         # equation = check_type("data", data, cls.datatype)
         return True
 
     @ classmethod
-    def is_flag(cls, flag):
+    def is_flag(cls, flag, level=None):
+        level = cls.get_level(level)
+        if level == 'off':
+            return True
         try:
-            check_type("flag", flag, cls.flagtype)
+            if level == 'fast':
+                cls._fast_check(flag, cls.fast_flagtype)
+            else:
+                check_type("flag", flag, cls.flagtype)
             return True
         except:
             error_handler("Flag failed type check", "Type")
             return False
 
     @ classmethod
-    def is_node(cls, node):
+    def is_node(cls, node, level=None):
+        level = cls.get_level(level)
+        if level == 'off':
+            return True
         try:
-            check_type("node", node, cls.nodetype)
+            if level == 'fast':
+                cls._fast_check(node, cls.nodetype)
+            else:
+                check_type("node", node, cls.nodetype)
             return True
         except:
             error_handler("Node failed type check", "Type")
             return False
 
     @ classmethod
-    def is_weight(cls, weight):
+    def is_weight(cls, weight, level=None):
+        level = cls.get_level(level)
+        if level == 'off':
+            return True
         try:
-            check_type("weight", weight, cls.weighttype)
+            if level == 'fast':
+                cls._fast_check(weight, cls.fast_weighttype)
+            else:
+                check_type("weight", weight, cls.weighttype)
             return True
         except:
             error_handler("Weight failed type check", "Type")
             return False
 
+    # Container checks. 'full' checks elements through typeguard once,
+    # 'fast' checks them with isinstance. Both check id bounds
     @ classmethod
-    def is_nodelist(cls, nodelist):
+    def is_nodelist(cls, nodelist, level=None):
+        level = cls.get_level(level)
+        if level == 'off':
+            return True
         try:
-            check_type("nodelist", nodelist, cls.nodelisttype)
-            for key, val in nodelist.items():
-                cls.is_id(key)
-                cls.is_node(val)
+            if level == 'fast':
+                cls._fast_check(nodelist, dict)
+                for key, val in nodelist.items():
+                    cls._fast_check(key, cls.fast_idtype)
+                    cls._fast_check(val, cls.nodetype)
+            else:
+                check_type("nodelist", nodelist, cls.nodelisttype)
+            if nodelist and min(nodelist) < 0:
+                error_handler("Id out of bounds", "Key")
             return True
         except:
             error_handler("nodelist failed type check", "Type")
             return False
 
     @ classmethod
-    def is_edgelist(cls, edgelist):
+    def is_edgelist(cls, edgelist, level=None):
+        level = cls.get_level(level)
+        if level == 'off':
+            return True
         try:
-            check_type("edgelist", edgelist, cls.edgelisttype)
-            for key, weight in edgelist.items():
-                cls.is_id(key)
-                if weight != None:
-                    cls.is_weight(weight)
+            if level == 'fast':
+                cls._fast_check(edgelist, dict)
+                for key, weight in edgelist.items():
+                    cls._fast_check(key, cls.fast_idtype)
+                    if weight != None:
+                        cls._fast_check(weight, cls.fast_weighttype)
+            else:
+                check_type("edgelist", edgelist, cls.edgelisttype)
+            if edgelist and min(edgelist) < 0:
+                error_handler("Id out of bounds", "Key")
             return True
         except:
             error_handler("edgelist failed type check", "Type")
             return False
 
     @ classmethod
-    def is_adjmatrix(cls, adj_mat):
+    def is_adjmatrix(cls, adj_mat, level=None):
+        level = cls.get_level(level)
+        if level == 'off':
+            return True
         try:
-            check_type("adjmatrix", adj_mat, cls.adjmatrixtype)
+            if level == 'fast':
+                cls._fast_check(adj_mat, (list, np.ndarray))
+            else:
+                check_type("adjmatrix", adj_mat, cls.adjmatrixtype)
             mat_n = len(adj_mat)
             for line in adj_mat:
                 if len(line) != mat_n:
@@ -231,18 +412,30 @@ class Type():
             return False
 
     @ classmethod
-    def is_adjlist(cls, adj_list):
+    def is_adjlist(cls, adj_list, level=None):
+        level = cls.get_level(level)
+        if level == 'off':
+            return True
         try:
-            check_type("adjlist", adj_list, cls.adjlisttype)
+            if level == 'fast':
+                cls._fast_check(adj_list, (list, np.ndarray))
+            else:
+                check_type("adjlist", adj_list, cls.adjlisttype)
             return True
         except:
             error_handler("adjlist failed type check", "Type")
             return False
 
     @ classmethod
-    def is_adjdict(cls, adj_dict):
+    def is_adjdict(cls, adj_dict, level=None):
+        level = cls.get_level(level)
+        if level == 'off':
+            return True
         try:
-            check_type("adjdict", adj_dict, cls.adjdicttype)
+            if level == 'fast':
+                cls._fast_check(adj_dict, dict)
+            else:
+                check_type("adjdict", adj_dict, cls.adjdicttype)
             return True
         except:
             error_handler("adjdict failed type check", "Type")
@@ -251,53 +444,417 @@ class Type():
 # =============================================================================
 
 
-# Node class. Creates node objects with data, flag and edges
-class Node():
+# Journal class. Records graph changes in a bounded ring buffer
+class Journal():
     """
-    Node class
-    Creates node objects with data, flag and edges
-    Creates empty edges as an empty dictionary when no edge is called 
+    Journal class
+    Records graph changes as compact (time, graph_id, op, args) tuples in a
+    bounded ring buffer. Oldest records are dropped when it is full
+    Messages are only formatted when records are flushed or read as text
+    Attach it to graphs with Graph(journal=...) or graph.journal
     """
 
-    def __init__(self,
-                 data: Type.datatype = None,
-                 flag: Type.flagtype = None,
-                 edges: Type.edgelisttype = None):
+    # Message of each change. Graph id is always the last argument
+    messages = {
+        'add_edge': " Edge (%s->%s [%s]) added to graph #%s",
+        'remove_edge': " Edge (%s->%s) removed from graph #%s",
+        'add_node': " Node #%s added to graph #%s",
+        'remove_node': " Node #%s removed from graph #%s",
+        'add_nodes': " %s nodes added to graph #%s",
+        'add_edges': " %s edges added to graph #%s",
+        'remove_edges': " %s edges removed from graph #%s",
+        'compact': " Ids compacted to 0..%s in graph #%s",
+    }
+
+    def __init__(self, maxlen: int = 100_000,
+                 path: str = None,
+                 batch_size: int = None):
         """
-        Initializes a node
+        Initializes an empty journal
 
         Args:
-            data (Type.datatype, optional): Internal node data. Defaults to None.
-            flag (Type.flagtype, optional): Node flag. Defaults to None.
-            edges (Type.edgelisttype, optional): Node edges. Defaults to None.
+            maxlen (int, optional): Most records kept in memory. Defaults to 100_000.
+            path (str, optional): File records are appended to on flush. Defaults to None.
+            batch_size (int, optional): Flushes to path whenever this many records
+                are pending. Defaults to None (manual flush only).
         """
-        # your object
-        self.data = data
-        # int, float or str. May be used for node markings
-        self.flag = flag
-        # Dict{id : weight}
-        # Check and attribution necessary due to dictionary particulars
-        if edges == None:
-            edges = {}
-        self.edges = edges
+        if not isinstance(maxlen, int) or maxlen <= 0:
+            error_handler("maxlen is not a positive int", "Value")
+        if batch_size is not None:
+            if path is None:
+                error_handler("batch_size requires a path", "Value")
+            if not 0 < batch_size <= maxlen:
+                error_handler("batch_size must be in (0, maxlen]", "Value")
+        self.records = collections.deque(maxlen=maxlen)
+        self.path = path
+        self.batch_size = batch_size
+        # Records lost to the ring buffer before being flushed
+        self.dropped = 0
 
     def __len__(self):
-        return len(self.edges)
+        return len(self.records)
 
-    def set_data(self, data: Type.datatype):
-        raise NotImplementedError
+    def __iter__(self):
+        return iter(self.records)
 
-    def get_data(self):
-        raise NotImplementedError
+    # Journals are output sinks, so graph copies share them
+    def __deepcopy__(self, memo):
+        return self
 
-    def set_flag(self, flag: Type.flagtype):
-        raise NotImplementedError
+    def record(self, graph_id: int, op: str, args: tuple):
+        """
+        Appends a change record. Constant time
 
-    def get_flag(self):
-        raise NotImplementedError
+        Args:
+            graph_id (int): Id of the changed graph
+            op (str): Change name, a key of messages
+            args (tuple): Change arguments
+        """
+        if len(self.records) == self.records.maxlen:
+            self.dropped += 1
+        self.records.append((time.time(), graph_id, op, args))
+        if self.batch_size is not None and len(self.records) >= self.batch_size:
+            self.flush()
 
-    def set_edges(self):
-        raise NotImplementedError
+    @ classmethod
+    def format(cls, record: tuple):
+        """
+        Formats a record as a log line
+
+        Args:
+            record (tuple): (time, graph_id, op, args) record
+
+        Returns:
+            str: Formatted line, without newline
+        """
+        when, graph_id, op, args = record
+        date = time.strftime("%d-%m-%y %H:%M:%S", time.localtime(when))
+        return f"{date} - CHANGE -{cls.messages[op] % (*args, graph_id)}"
+
+    def flush(self, file=None):
+        """
+        Writes pending records as text in a single batch and clears them
+
+        Args:
+            file (str or file object, optional): Destination. Defaults to path.
+
+        Returns:
+            int: Number of records written
+        """
+        if file is None:
+            file = self.path
+        if file is None:
+            error_handler("Journal has no path to flush to", "Value")
+            return 0
+        count = len(self.records)
+        if not count:
+            return 0
+        text = "\n".join(map(self.format, self.records)) + "\n"
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, 'a') as handle:
+                handle.write(text)
+        else:
+            file.write(text)
+        self.records.clear()
+        return count
+
+    def clear(self):
+        self.records.clear()
+
+# =============================================================================
+
+
+# Reader-writer lock for concurrent graphs
+class RWLock():
+    """
+    Reader-writer lock. Many readers or a single writer hold it at a time
+    Waiting writers block new readers, so updates are not starved
+    Both sides are reentrant per thread, and the writer may also read.
+    A reader may not upgrade to writer: it would deadlock with other readers
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._writes = 0
+        self._waiting_writers = 0
+        # {thread id: [read depth, whether it counts in _readers]}. Kept by
+        # thread id rather than thread-local, so a hold may be released from
+        # another thread (e.g. a traversal closed or collected elsewhere)
+        self._holds = {}
+
+    # Locks are not copied along with graphs
+    def __deepcopy__(self, memo):
+        return RWLock()
+
+    def acquire_read(self):
+        me = threading.get_ident()
+        with self._condition:
+            hold = self._holds.get(me)
+            if hold is not None:
+                hold[0] += 1
+                return
+            if self._writer == me:
+                self._holds[me] = [1, False]
+                return
+            while self._writer is not None or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+            self._holds[me] = [1, True]
+
+    def release_read(self, owner: int = None):
+        """
+        Args:
+            owner (int, optional): Id of the thread holding the read lock.
+                Defaults to the current thread.
+        """
+        if owner is None:
+            owner = threading.get_ident()
+        with self._condition:
+            hold = self._holds.get(owner)
+            if hold is None:
+                error_handler("Read lock is not held by this thread", "Runtime")
+                return
+            hold[0] -= 1
+            if hold[0]:
+                return
+            del self._holds[owner]
+            if hold[1]:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        if self._writer == me:
+            self._writes += 1
+            return
+        with self._condition:
+            hold = self._holds.get(me)
+            if hold is not None and hold[1]:
+                error_handler("Read lock cannot be upgraded to write",
+                              "Runtime")
+            self._waiting_writers += 1
+            while self._writer is not None or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = me
+            self._writes = 1
+
+    def release_write(self):
+        if self._writer != threading.get_ident():
+            error_handler("Write lock is not held by this thread", "Runtime")
+        self._writes -= 1
+        if not self._writes:
+            with self._condition:
+                self._writer = None
+                # Reads taken while writing now count as shared ones
+                hold = self._holds.get(threading.get_ident())
+                if hold is not None:
+                    hold[1] = True
+                    self._readers += 1
+                self._condition.notify_all()
+
+    @ contextlib.contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield self
+        finally:
+            self.release_read()
+
+    @ contextlib.contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield self
+        finally:
+            self.release_write()
+
+
+# Runs a Graph method under its lock, when the graph is concurrent
+def _synchronized(mode: str):
+    def decorator(method):
+        @ functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            lock = self._lock
+            if lock is None:
+                return method(self, *args, **kwargs)
+            if mode == 'write':
+                lock.acquire_write()
+                try:
+                    return method(self, *args, **kwargs)
+                finally:
+                    lock.release_write()
+            lock.acquire_read()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                lock.release_read()
+        return wrapper
+    return decorator
+
+
+# Runs a function of a graph under its read lock, when the graph is concurrent
+def _reads_graph(function):
+    @ functools.wraps(function)
+    def wrapper(graph, *args, **kwargs):
+        lock = graph._lock if isinstance(graph, Graph) else None
+        if lock is None:
+            return function(graph, *args, **kwargs)
+        lock.acquire_read()
+        try:
+            return function(graph, *args, **kwargs)
+        finally:
+            lock.release_read()
+    return wrapper
+
+
+# Memoizes a graph algorithm while the graph does not change
+# Runs under the graph's read lock, cached or not
+def _cached(op: str):
+    def decorator(function):
+        @ _reads_graph
+        @ functools.wraps(function)
+        def wrapper(graph, *args, **kwargs):
+            cache = getattr(graph, 'cache', None)
+            if cache is None:
+                return function(graph, *args, **kwargs)
+            return cache.get_or_compute(graph, op, args, kwargs, function)
+        return wrapper
+    return decorator
+
+# =============================================================================
+
+
+# Bounded memo of results computed from graphs
+class ResultCache():
+    """
+    LRU memo of graph conversions and algorithm results
+    Entries are keyed on (graph uid, graph version, operation, args). Every
+    mutator bumps the graph version, so results of older states are never
+    served again and age out of the cache. May be shared by many graphs
+    Numpy arrays among cached results are shared between callers and made
+    read-only. Lists and dicts (e.g. adjacency lists) are handed out as
+    fresh copies of their outer two levels, so callers own them as when
+    uncached
+    Changing node.data or node.flag directly does not bump the version
+    """
+
+    def __init__(self, maxsize: int = 128):
+        """
+        Args:
+            maxsize (int, optional): Maximum number of results kept. Defaults to 128.
+        """
+        if not isinstance(maxsize, int) or maxsize < 1:
+            error_handler("maxsize is not a positive int", "Value")
+        self.maxsize = maxsize
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    # Caches are shared sinks, so graph copies share them
+    def __deepcopy__(self, memo):
+        return self
+
+    @ staticmethod
+    def _key(value):
+        # Lists and dicts become tuples, so common arguments are hashable
+        if isinstance(value, (list, tuple)):
+            return tuple(ResultCache._key(item) for item in value)
+        if isinstance(value, dict):
+            return tuple(sorted((key, ResultCache._key(item))
+                                for key, item in value.items()))
+        return value
+
+    def get_or_compute(self, graph, op: str, args: tuple, kwargs: dict,
+                       function):
+        """
+        Returns the cached result of function(graph, *args, **kwargs), or
+        computes and stores it. Failed (False) results are not stored
+
+        Args:
+            graph (Graph): Graph the result is computed from
+            op (str): Operation name
+            args (tuple): Positional arguments
+            kwargs (dict): Keyword arguments
+            function (callable): Computes the result
+
+        Returns:
+            Any: Result of function
+        """
+        try:
+            key = (graph._uid, graph.version, op,
+                   self._key(args), self._key(kwargs))
+            hash(key)
+        except TypeError:
+            # Unhashable arguments (e.g. arrays) are not cached
+            return function(graph, *args, **kwargs)
+        with self._lock:
+            if key in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return self._handout(self.entries[key])
+            self.misses += 1
+        result = function(graph, *args, **kwargs)
+        if result is not False:
+            # Shared arrays are made read-only, so a caller writing into
+            # one fails instead of changing later hits
+            for item in result if isinstance(result, tuple) else (result,):
+                if isinstance(item, np.ndarray):
+                    item.flags.writeable = False
+            with self._lock:
+                self.entries[key] = result
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.maxsize:
+                    self.entries.popitem(last=False)
+            return self._handout(result)
+        return result
+
+    # Copies the mutable parts of a stored result for one caller
+    @ staticmethod
+    def _handout(result):
+        """
+        Copies lists and dicts of a result, and the lists and dicts they
+        hold, so rows of adjacency lists, matrices and dicts are the
+        caller's own. Arrays are read-only and shared, other items shared
+        """
+        def inner(item):
+            if isinstance(item, list):
+                return list(item)
+            if isinstance(item, dict):
+                return dict(item)
+            return item
+
+        def outer(item):
+            if isinstance(item, list):
+                return [inner(row) for row in item]
+            if isinstance(item, dict):
+                return {key: inner(row) for key, row in item.items()}
+            return item
+
+        if isinstance(result, tuple):
+            return tuple(outer(item) for item in result)
+        return outer(result)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """
+        Returns:
+            dict: hits, misses, size and maxsize of the cache
+        """
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self.entries), 'maxsize': self.maxsize}
 
 # =============================================================================
 
@@ -313,19 +870,42 @@ class Graph():
 
     # Each graph has a specific class id for logging purposes
     graph_count = 0
+    _graph_count_lock = threading.Lock()
+    # Unique per graph object, copies included. Keys cached results
+    _uids = itertools.count()
 
     # Advanced settings. Only touch when sure
     # Checks new graph by default. Can be toggled for performance
     check_graph_at_initialization = True
+    # Checks only the node or edge being changed instead of the whole graph
+    incremental_validation = True
     # Raise exception whenever a mistake is made by default, whether fatal or not
 
-    def __init__(self, nodes: Type.nodelisttype = None):
+    def __init__(self, nodes: Type.nodelisttype = None,
+                 reverse_index: bool = False,
+                 validation: str = None,
+                 journal: Journal = None,
+                 concurrent: bool = False,
+                 cache: ResultCache = None,
+                 id_policy: str = 'increment',
+                 counters: bool = False):
         """
         Initializes new graph objects and call validators
         Calls class specific functions to deal with class attributes
 
         Args:
             nodes (Type.nodelisttype, optional): Dict {id: Node} of nodes. Defaults to None.
+            reverse_index (bool, optional): Whether to keep an in-edge index. Defaults to False.
+            validation (str, optional): Validation level of this graph ('off', 'fast' or 'full'). Defaults to VALIDATION.
+            journal (Journal, optional): Journal recording every change. Defaults to None.
+            concurrent (bool, optional): Whether methods are guarded by a reader-writer
+                lock, for graphs shared between threads. Defaults to False.
+            cache (ResultCache, optional): Memo of conversions and algorithm results.
+                Defaults to None.
+            id_policy (str, optional): 'increment' always allocates last_id + 1,
+                'reuse' allocates the smallest removed id first. Defaults to 'increment'.
+            counters (bool, optional): Whether to keep running edge count, total
+                weight and degree arrays. Defaults to False.
         """
 
         # Dict{id : Node}
@@ -338,186 +918,2393 @@ class Graph():
 
         # Dict{id : Node}
         self.nodes = nodes
-        # Registers last used id
-        self.last_id = self.size - 1
+        # Registers last used id. Ids may be sparse (e.g. after removals)
+        self.last_id = max(nodes) if nodes else -1
+        # Validation level. None follows the global VALIDATION
+        if validation is not None:
+            Type.get_level(validation)
+        self.validation = validation
+        # Records changes when set. May be shared by many graphs
+        self.journal = journal
+        # Ids of nodes this graph may change in place. None when it owns
+        # every node. Snapshots share nodes and copy them on first write
+        self._owned = None
+        # Reader-writer lock. None when graph is not concurrent
+        if not isinstance(concurrent, bool):
+            error_handler("concurrent is not bool", "Type")
+        self._lock = RWLock() if concurrent else None
+        # Bumped by every change. Cached results hold the version they
+        # were computed at
+        self.version = 0
+        self._uid = next(Graph._uids)
+        if cache is not None and not isinstance(cache, ResultCache):
+            error_handler("cache is not a ResultCache", "Type")
+        self.cache = cache
+        # Min-heap of removed ids, given back first under the 'reuse' policy
+        if id_policy not in ID_POLICIES:
+            error_handler(f"id_policy must be one of {ID_POLICIES}", "Value")
+        self.id_policy = id_policy
+        self._free_ids = []
+        if id_policy == 'reuse':
+            self._free_ids = [id for id in range(self.last_id + 1)
+                              if id not in nodes]
 
         # Check whether starter graph is valid
         if self.check_graph_at_initialization:
             Validator.is_graph(self)
 
-        logging.info(
-            f" Graph #{self.graph_id} initialized with size {self.size}")
-        if VERBOSE:
-            logging.info(str(Converter.to_adjdict(self)))
+        # Dict{id : set of predecessor ids}. None when index is off
+        self.in_edges = None
+        if reverse_index:
+            self.set_reverse_index(True)
+
+        # Running totals. Degree arrays are indexed by id and None when off
+        self._in_degree = None
+        self._out_degree = None
+        self._num_edges = 0
+        self._total_weight = 0
+        if counters:
+            self.set_counters(True)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(" Graph #%s initialized with size %s",
+                        self.graph_id, self.size)
+            if VERBOSE:
+                logger.info(str(Converter.to_adjdict(self)))
 
     def __len__(self):
         return len(self.nodes)
 
+    def __contains__(self, id):
+        return id in self.nodes
+
     @ property
     def size(self):
         return self.__len__()
 
+    @ property
+    def validation_level(self):
+        return Type.get_level(self.validation)
+
+    @ property
+    def concurrent(self):
+        return self._lock is not None
+
     @ classmethod
     def set_graph_id(cls):
-        cls.graph_count += 1
-        return cls.graph_count - 1
+        with cls._graph_count_lock:
+            cls.graph_count += 1
+            return cls.graph_count - 1
+
+    # Id the next added node gets
+    def _next_id(self):
+        if self._free_ids:
+            return self._free_ids[0]
+        return self.last_id + 1
+
+    # Takes count ids according to the id policy
+    def _allocate_ids(self, count: int):
+        """
+        Takes count ids, removed ones first under the 'reuse' policy, and
+        moves last_id past them. Callers hold the write lock
 
-    # Adds edge source_id -> target_id with weight when applicable
-    def add_edge(self, source_id: Type.idtype,
-                 target_id: Type.idtype,
-                 weight: Type.weighttype = 0,
-                 symmetric: bool = False):
+        Args:
+            count (int): Number of ids
+
+        Returns:
+            list: Allocated ids
+        """
+        free_ids = self._free_ids
+        reused = [heapq.heappop(free_ids)
+                  for _ in range(min(count, len(free_ids)))]
+        first_id = self.last_id + 1
+        fresh = list(range(first_id, first_id + count - len(reused)))
+        if fresh:
+            self.last_id = fresh[-1]
+            self._grow_counters()
+        return reused + fresh
+
+    # Dense position of every live id
+    def _dense_map(self):
+        """
+        Maps live ids to dense positions 0..size - 1, in id order
+        Runs in O(last_id)
+
+        Returns:
+            np.ndarray, np.ndarray: Live ids by position, and old id -> position
+                array with -1 for unused ids
+        """
+        present = np.zeros(self.last_id + 1, dtype=np.bool_)
+        present[np.fromiter(self.nodes, dtype=np.int64,
+                            count=len(self.nodes))] = True
+        remap = np.cumsum(present, dtype=np.int64) - 1
+        remap[~present] = -1
+        return np.flatnonzero(present), remap
+
+    # Shared section for many reads over a consistent state
+    def read(self):
+        """
+        Context manager holding the read lock, so a group of lookups or an
+        algorithm (Paths, Centrality...) sees one consistent state
+        Does nothing when graph is not concurrent
+
+        Returns:
+            context manager: Read section
+        """
+        if self._lock is None:
+            return contextlib.nullcontext(self)
+        return self._lock.read()
+
+    # Exclusive section for many updates
+    def batch(self):
+        """
+        Context manager holding the write lock, so many updates are applied
+        in one exclusive section. Readers never see them half done
+        Mutators called inside it reenter the lock for free
+        Does nothing when graph is not concurrent
+
+        Returns:
+            context manager: Write section
+        """
+        if self._lock is None:
+            return contextlib.nullcontext(self)
+        return self._lock.write()
+
+    # Holds the read lock while a lazy traversal is being consumed
+    def _locked_iter(self, iterator):
+        lock = self._lock
+        lock.acquire_read()
+        # The generator may be closed, or collected, on another thread
+        owner = threading.get_ident()
+        try:
+            yield from iterator
+        finally:
+            lock.release_read(owner)
+
+    # Runs a traversal of this graph, or of a view of it
+    def _traverse(self, traversal, walk, graph, source_id, max_depth):
+        """
+        While concurrent, arguments are checked up front, then checked again
+        and bound to the node dict on first next(), once the read lock that
+        is held until the traversal is consumed or closed is taken
+        """
+        if self._lock is None:
+            return traversal(graph, source_id, max_depth)
+        with self._lock.read():
+            Traversal._check(graph, source_id, max_depth)
+        return self._locked_iter(
+            Traversal._deferred(walk, graph, source_id, max_depth))
+
+    # Toggles the in-edge index
+    @ _synchronized('write')
+    def set_reverse_index(self, enabled: bool = True):
+        """
+        Toggles the in-edge index {id: set of predecessor ids}
+        While on, it is kept in sync by every mutator, so remove_node only
+        touches actual predecessors. Building it costs O(V+E)
+
+        Args:
+            enabled (bool, optional): Whether index is kept. Defaults to True.
+        """
+        if not isinstance(enabled, bool):
+            error_handler("enabled is not bool", "Type")
+        if not enabled:
+            self.in_edges = None
+            return
+        in_edges = {id: set() for id in self.nodes}
+        for source_id, node in self.nodes.items():
+            for target_id in node.edges:
+                in_edges[target_id].add(source_id)
+        self.in_edges = in_edges
+
+    # Toggles running edge and degree counters
+    @ _synchronized('write')
+    def set_counters(self, enabled: bool = True):
+        """
+        Toggles running totals: edge count, total weight and in and out
+        degree arrays indexed by id. While on, they are kept in sync by
+        every mutator, so num_edges, total_weight and in_degree are O(1)
+        and degree_histogram is O(V). Building them costs O(V+E)
+        Code writing to node.edges directly bypasses them
+
+        Args:
+            enabled (bool, optional): Whether counters are kept. Defaults to True.
+        """
+        if not isinstance(enabled, bool):
+            error_handler("enabled is not bool", "Type")
+        if not enabled:
+            self._in_degree = self._out_degree = None
+            return
+        capacity = self.last_id + 1
+        out_degree = np.zeros(capacity, dtype=np.int64)
+        num_edges = 0
+        total_weight = 0
+        for id, node in self.nodes.items():
+            out_degree[id] = len(node.edges)
+            num_edges += len(node.edges)
+            total_weight += sum(node.edges.values())
+        targets = np.fromiter((target_id for node in self.nodes.values()
+                               for target_id in node.edges),
+                              dtype=np.int64, count=num_edges)
+        self._in_degree = np.bincount(targets, minlength=capacity)
+        self._out_degree = out_degree
+        self._num_edges = num_edges
+        self._total_weight = total_weight
+
+    # Makes room in degree arrays for every allocated id
+    def _grow_counters(self):
+        size = self.last_id + 1
+        if self._in_degree is None or len(self._in_degree) >= size:
+            return
+        # Doubling keeps growth amortized O(1) per node
+        capacity = max(size, 2 * len(self._in_degree), 16)
+        for name in ('_in_degree', '_out_degree'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=np.int64)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    # Counts edges about to be written from source_id
+    def _count_edges(self, source_id, edges, target_ids, weights):
+        """
+        Updates counters for edges about to be written to edges, the edge
+        list of source_id. Overwritten edges only change the total weight
+        """
+        in_degree = self._in_degree
+        written = {}
+        added = 0
+        total = 0
+        for target_id, weight in zip(target_ids, weights):
+            if target_id in written:
+                total += weight - written[target_id]
+            elif target_id in edges:
+                total += weight - edges[target_id]
+            else:
+                added += 1
+                total += weight
+                in_degree[target_id] += 1
+            written[target_id] = weight
+        self._out_degree[source_id] += added
+        self._num_edges += added
+        self._total_weight += total
+
+    # Counts a deleted edge
+    def _uncount_edge(self, source_id, target_id, weight):
+        self._out_degree[source_id] -= 1
+        self._in_degree[target_id] -= 1
+        self._num_edges -= 1
+        self._total_weight -= weight
+
+    # Records a change in the journal and in the log
+    def _log_change(self, op, *args):
+        """
+        Records a change in the journal, if any, and in the log
+        Log messages (and VERBOSE dumps) are only built when INFO is enabled
+
+        Args:
+            op (str): Change name, a key of Journal.messages
+            *args: Change arguments, as expected by its message
+        """
+        self.version += 1
+        if self.journal is not None:
+            self.journal.record(self.graph_id, op, args)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(Journal.messages[op], *args, self.graph_id)
+            if VERBOSE:
+                logger.info(str(Converter.to_adjdict(self)))
+
+    # Returns node id, ready to be changed in place
+    def _node_for_write(self, id):
+        """
+        Returns node id ready to be changed in place
+        Nodes shared with a snapshot are copied first (copy-on-write). Their
+        edges are copied too, while data is shared by reference
+
+        Args:
+            id (Type.idtype): Node id
+
+        Returns:
+            Node: Node owned by this graph, with edges of its own
+        """
+        self.version += 1
+        node = self.nodes[id]
+        if self._owned is not None and id not in self._owned:
+            node = Node(node.data, node.flag,
+                        dict(node.edges) if node.edges else None)
+            self.nodes[id] = node
+            self._owned.add(id)
+        node._own_edges()
+        return node
+
+    # Writes edge, keeping indexes in sync
+    def _set_edge(self, source_id, target_id, weight):
+        edges = self._node_for_write(source_id).edges
+        if self._in_degree is not None:
+            self._count_edges(source_id, edges, (target_id,), (weight,))
+        edges[target_id] = weight
+        if self.in_edges is not None:
+            self.in_edges[target_id].add(source_id)
+
+    # Writes edges leaving one source, keeping indexes in sync
+    def _set_edges(self, source_id, target_ids, weights):
+        edges = self._node_for_write(source_id).edges
+        if self._in_degree is not None:
+            self._count_edges(source_id, edges, target_ids, weights)
+        edges.update(zip(target_ids, weights))
+        if self.in_edges is not None:
+            for target_id in target_ids:
+                self.in_edges[target_id].add(source_id)
+
+    # Deletes edge, keeping indexes in sync
+    def _del_edge(self, source_id, target_id):
+        weight = self._node_for_write(source_id).edges.pop(target_id)
+        if self._in_degree is not None:
+            self._uncount_edge(source_id, target_id, weight)
+        if self.in_edges is not None:
+            self.in_edges[target_id].discard(source_id)
+
+    @ _synchronized('read')
+    def successors(self, id: Type.idtype):
+        """
+        Iterates over ids that node id has an edge to
+
+        Args:
+            id (Type.idtype): Node id
+
+        Returns:
+            Iterator: Target ids
+        """
+        return iter(self.nodes[id].edges)
+
+    @ _synchronized('read')
+    def predecessors(self, id: Type.idtype):
+        """
+        Returns ids of nodes with an edge pointing to id
+        O(in degree) with the reverse index, O(V) without it
+
+        Args:
+            id (Type.idtype): Node id
+
+        Returns:
+            list: Predecessor ids
+            Bool: False when failed to find node
+        """
+        try:
+            Type.is_id(id, self.validation_level)
+            if id not in self.nodes:
+                error_handler("Node not found", "Key")
+            if self.in_edges is not None:
+                return list(self.in_edges[id])
+            return [source_id for source_id, node in self.nodes.items()
+                    if id in node.edges]
+        except:
+            error_handler("Node not found", "Key")
+            return False
+
+    @ _synchronized('read')
+    def in_degree(self, id: Type.idtype):
+        """
+        Returns number of edges pointing to id
+        O(1) with counters or the reverse index, O(V) without them
+
+        Args:
+            id (Type.idtype): Node id
+
+        Returns:
+            int: In degree
+            Bool: False when failed to find node
+        """
+        if self._in_degree is not None and id in self.nodes:
+            return int(self._in_degree[id])
+        if self.in_edges is not None and id in self.in_edges:
+            return len(self.in_edges[id])
+        predecessors = self.predecessors(id)
+        if predecessors is False:
+            return False
+        return len(predecessors)
+
+    @ _synchronized('read')
+    def out_degree(self, id: Type.idtype):
+        """
+        Returns number of edges leaving id. O(1)
+
+        Args:
+            id (Type.idtype): Node id
+
+        Returns:
+            int: Out degree
+            Bool: False when failed to find node
+        """
+        if id not in self.nodes:
+            error_handler("Node not found", "Key")
+            return False
+        return len(self.nodes[id].edges)
+
+    @ property
+    @ _synchronized('read')
+    def num_edges(self):
+        """
+        Number of edges. O(1) with counters, O(V) without them
+        """
+        if self._in_degree is not None:
+            return self._num_edges
+        return sum(len(node.edges) for node in self.nodes.values())
+
+    @ property
+    @ _synchronized('read')
+    def total_weight(self):
+        """
+        Sum of edge weights. O(1) with counters, O(V+E) without them
+        """
+        if self._in_degree is not None:
+            return self._total_weight
+        return sum(sum(node.edges.values()) for node in self.nodes.values())
+
+    @ _synchronized('read')
+    def degree_histogram(self, direction: str = 'out'):
+        """
+        Counts nodes by degree
+        O(V) with counters or for out degrees, O(V+E) for in degrees without them
+
+        Args:
+            direction (str, optional): 'out' or 'in'. Defaults to 'out'.
+
+        Returns:
+            np.ndarray: Number of nodes with each degree, indexed by degree
+            Bool: False when failed
+        """
+        try:
+            if direction not in ('out', 'in'):
+                error_handler("direction must be 'out' or 'in'", "Value")
+            ids = np.fromiter(self.nodes, dtype=np.int64, count=len(self.nodes))
+            if self._in_degree is not None:
+                degrees = (self._out_degree if direction == 'out'
+                           else self._in_degree)[ids]
+            elif direction == 'out':
+                degrees = np.fromiter((len(node.edges)
+                                       for node in self.nodes.values()),
+                                      dtype=np.int64, count=len(self.nodes))
+            else:
+                targets = np.fromiter((target_id for node in self.nodes.values()
+                                       for target_id in node.edges),
+                                      dtype=np.int64)
+                degrees = np.bincount(targets,
+                                      minlength=self.last_id + 1)[ids]
+            return np.bincount(degrees, minlength=1 if len(ids) else 0)
+        except:
+            error_handler("Broken graph in degree_histogram", "Runtime")
+            return False
+
+    # Adds edge source_id -> target_id with weight when applicable
+    @ _synchronized('write')
+    def add_edge(self, source_id: Type.idtype,
+                 target_id: Type.idtype,
+                 weight: Type.weighttype = 0,
+                 symmetric: bool = False):
+        """
+        Adds edge source_id -> target_id with weight when applicable
+        Adds edge symmetrically (if (a,b) in edges, then (b, a) also in edges)) when toggled
+
+        Args:
+            source_id (Type.idtype): Edge origin node. Where edge is stored
+            target_id (Type.idtype): Edge target node. Key on edges in node[source_id]
+            weight (Type.weighttype, optional): Edge weight. Defaults to 0.
+            symmetric (bool, optional): Whether edge is to be added symmetrically. Defaults to False.
+
+        Returns:
+            Bool: Whether edge was added or not
+        """
+        try:
+            Validator.check_edge(source_id, target_id, weight, self,
+                                 level=self.validation_level)
+            if not isinstance(symmetric, bool):
+                error_handler("Symmetric is not bool", "Type")
+
+            self._set_edge(source_id, target_id, weight)
+            self._log_change('add_edge', source_id, target_id, weight)
+            if symmetric:
+                self.add_edge(target_id, source_id, weight)
+            return True
+
+        except:
+            error_handler("Edge's id(s) not in nodes", "Key")
+            return False
+
+    @ _synchronized('write')
+    def remove_edge(self, source_id: Type.idtype, target_id: Type.idtype, symmetric: bool = False):
+        """
+        Removes edge source_id -> target_id
+        Removes edge symmetrically (if (a,b) in edges, then (b, a) also in edges)) when toggled
+
+        Args:
+            source_id (Type.idtype): Edge origin node. Where edge is stored
+            target_id (Type.idtype): Edge target node. Key on edges in node[source_id]
+            symmetric (bool, optional): Whether edge is to be removed symmetrically. Defaults to False.
+
+        Returns:
+            Bool: Whether edge was removed or not
+        """
+        try:
+            level = self.validation_level
+            Type.is_id(source_id, level)
+            Type.is_id(target_id, level)
+            if not isinstance(symmetric, bool):
+                error_handler("Symmetric is not bool", "Type")
+
+            if not (source_id in self.nodes and target_id in self.nodes):
+                error_handler("Edge id not found", "Key")
+
+            if symmetric:
+                self.remove_edge(target_id, source_id)
+
+            node = self.nodes[source_id]
+            if node.edges:
+                if target_id in node.edges:
+                    self._del_edge(source_id, target_id)
+                    self._log_change('remove_edge', source_id, target_id)
+                    return True
+            error_handler("Edge not found", "Key")
+        except:
+            error_handler("Edge not found", "Key")
+            return False
+
+    # Adds nodes with data, flag and edges when applicable
+    @ _synchronized('write')
+    def add_node(self, data: Type.datatype = None,
+                 flag: Type.flagtype = None,
+                 edges: Type.edgelist = None):
+        """
+        Adds nodes with data, flag and edges when applicable
+
+        Args:
+            data (Type.datatype, optional): Node data. Defaults to None.
+            flag (Type.flagtype, optional): Node flag. Defaults to None.
+            edges (Type.edgelist, optional): Node edges. Defaults to None.
+
+        Returns:
+            Node: Returns added node object when valid
+            Bool: Returns False when failed adding node
+        """
+        new_node = Node(data, flag, edges)
+        try:
+            Validator.check_node(new_node, self, _adding=True,
+                                 incremental=self.incremental_validation,
+                                 level=self.validation_level)
+            new_id, = self._allocate_ids(1)
+            self.nodes[new_id] = new_node
+            if self._owned is not None:
+                self._owned.add(new_id)
+            if self.in_edges is not None:
+                self.in_edges[new_id] = set()
+                for target_id in new_node.edges:
+                    self.in_edges[target_id].add(new_id)
+            if self._in_degree is not None:
+                self._count_edges(new_id, {}, new_node.edges.keys(),
+                                  new_node.edges.values())
+
+            self._log_change('add_node', new_id)
+
+            return new_node
+        except:
+            error_handler("Node not valid. Was not added", "Key")
+            return False
+
+    # Removes nodes and all edges pointing to it
+    @ _synchronized('write')
+    def remove_node(self, id: Type.idtype):
+        """
+        Removes nodes and all edges pointing to it
+        With the reverse index only predecessors are visited, otherwise
+        every node is scanned
+
+        Args:
+            id (Type.idtype): Id of the node to be removed
+
+        Returns:
+            Node: Node removed when valid
+            Bool: False when failed to find node
+        """
+        try:
+            Type.is_id(id, self.validation_level)
+            if id in self.nodes:
+                popped = self.nodes.pop(id)
+                if self._owned is not None:
+                    self._owned.discard(id)
+                counted = self._in_degree is not None
+                if self.in_edges is not None:
+                    sources = [source_id for source_id in self.in_edges.pop(id)
+                               if source_id != id]
+                    for target_id in popped.edges:
+                        if target_id != id:
+                            self.in_edges[target_id].discard(id)
+                elif self.size > 0:
+                    sources = [source_id for source_id, node in self.nodes.items()
+                               if id in node.edges]
+                else:
+                    sources = []
+                for source_id in sources:
+                    weight = self._node_for_write(source_id).edges.pop(id)
+                    if counted:
+                        self._uncount_edge(source_id, id, weight)
+                if counted:
+                    for target_id, weight in popped.edges.items():
+                        self._uncount_edge(id, target_id, weight)
+                if self.id_policy == 'reuse':
+                    heapq.heappush(self._free_ids, id)
+                self._log_change('remove_node', id)
+                return popped
+        except:
+            error_handler("Node not found", "Key")
+            return False
+
+    # Adds many nodes at once
+    @ _synchronized('write')
+    def add_nodes(self, count: int = None,
+                  data: List[Type.datatype] = None,
+                  flags: List[Type.flagtype] = None):
+        """
+        Adds many nodes at once, writing a single log record
+        Nodes are added without edges. Use add_edges afterwards
+
+        Args:
+            count (int, optional): Number of nodes. Defaults to len(data) or len(flags).
+            data (List[Type.datatype], optional): Data for each node. Defaults to None.
+            flags (List[Type.flagtype], optional): Flag for each node. Defaults to None.
+
+        Returns:
+            list: Ids of the added nodes
+            Bool: False when failed adding nodes
+        """
+        try:
+            if count is None:
+                count = len(data) if data is not None else len(
+                    flags) if flags is not None else 0
+            if not isinstance(count, (int, np.integer)) or count < 0:
+                error_handler("count is not a non negative int", "Type")
+            for values in (data, flags):
+                if values is not None and len(values) != count:
+                    error_handler("Node lists differ in length", "Index")
+            if flags is not None:
+                level = self.validation_level
+                for flag in flags:
+                    if flag is not None:
+                        Type.is_flag(flag, level)
+
+            new_ids = self._allocate_ids(count)
+            for i, new_id in enumerate(new_ids):
+                self.nodes[new_id] = Node(
+                    data=None if data is None else data[i],
+                    flag=None if flags is None else flags[i])
+                if self.in_edges is not None:
+                    self.in_edges[new_id] = set()
+            if self._owned is not None:
+                self._owned.update(new_ids)
+
+            self._log_change('add_nodes', count)
+            return new_ids
+        except:
+            error_handler("Nodes not valid. None was added", "Key")
+            return False
+
+    # Adds many edges at once
+    @ _synchronized('write')
+    def add_edges(self, sources,
+                  targets=None,
+                  weights=0,
+                  symmetric: bool = False):
+        """
+        Adds many edges at once
+        Ids are validated in one vectorized pass before anything is changed,
+        and a single log record is written
+
+        Args:
+            sources (array-like): Edge origin ids, or (source, target[, weight])
+                rows when targets is None
+            targets (array-like, optional): Edge target ids. Defaults to None.
+            weights (array-like or Type.weighttype, optional): Edge weights. Defaults to 0.
+            symmetric (bool, optional): Whether edges are also added as target -> source. Defaults to False.
+
+        Returns:
+            Bool: Whether edges were added or not
+        """
+        try:
+            if not isinstance(symmetric, bool):
+                error_handler("Symmetric is not bool", "Type")
+            sources, targets, weights = self._edge_arrays(
+                sources, targets, weights)
+            if symmetric:
+                sources, targets = (np.concatenate((sources, targets)),
+                                    np.concatenate((targets, sources)))
+                weights = np.concatenate((weights, weights))
+
+            # Groups edges by source, so each node is updated once. Stable
+            # sort keeps the last weight of repeated edges, as add_edge would
+            order = np.argsort(sources, kind='stable')
+            sources, targets, weights = (sources[order], targets[order],
+                                         weights[order])
+            bounds = np.flatnonzero(np.diff(sources)) + 1
+            starts = [0] + bounds.tolist()
+            ends = bounds.tolist() + [len(sources)]
+            targets, weights = targets.tolist(), weights.tolist()
+            for source_id, start, end in zip(sources[starts].tolist()
+                                             if len(sources) else [],
+                                             starts, ends):
+                self._set_edges(source_id, targets[start:end],
+                                weights[start:end])
+
+            self._log_change('add_edges', len(sources))
+            return True
+        except:
+            error_handler("Edges not valid. None was added", "Key")
+            return False
+
+    # Removes many edges at once
+    @ _synchronized('write')
+    def remove_edges(self, sources,
+                     targets=None,
+                     symmetric: bool = False):
+        """
+        Removes many edges at once
+        All edges are checked before anything is changed, and a single log
+        record is written
+
+        Args:
+            sources (array-like): Edge origin ids, or (source, target) rows when
+                targets is None
+            targets (array-like, optional): Edge target ids. Defaults to None.
+            symmetric (bool, optional): Whether edges are also removed as target -> source. Defaults to False.
+
+        Returns:
+            Bool: Whether edges were removed or not
+        """
+        try:
+            if not isinstance(symmetric, bool):
+                error_handler("Symmetric is not bool", "Type")
+            sources, targets, _ = self._edge_arrays(sources, targets)
+            if symmetric:
+                sources, targets = (np.concatenate((sources, targets)),
+                                    np.concatenate((targets, sources)))
+
+            # Repeated pairs (e.g. both directions with symmetric) count once
+            pairs = dict.fromkeys(zip(sources.tolist(), targets.tolist()))
+            for source_id, target_id in pairs:
+                if target_id not in self.nodes[source_id].edges:
+                    error_handler("Edge not found", "Key")
+            for source_id, target_id in pairs:
+                self._del_edge(source_id, target_id)
+
+            self._log_change('remove_edges', len(pairs))
+            return True
+        except:
+            error_handler("Edges not valid. None was removed", "Key")
+            return False
+
+    # Parses and validates bulk edge input
+    def _edge_arrays(self, sources, targets=None, weights=0):
+        """
+        Parses bulk edge input into validated numpy arrays
+        Used internally by add_edges and remove_edges
+
+        Returns:
+            np.ndarray, np.ndarray, np.ndarray: Sources, targets and weights
+        """
+        if targets is None:
+            rows = sources if isinstance(sources, np.ndarray) else list(sources)
+            if len(rows) == 0:
+                rows = np.empty((0, 2), dtype=np.int64)
+            rows = np.asarray(rows)
+            if rows.ndim != 2 or rows.shape[1] not in (2, 3):
+                error_handler("Edge rows must be (source, target[, weight])",
+                              "Index")
+            if rows.shape[1] == 3:
+                weights = rows[:, 2]
+            # Rows with weights may be float, ids are checked to be integral
+            sources = rows[:, 0]
+            targets = rows[:, 1]
+            if sources.dtype.kind == 'f':
+                if not (np.all(sources == np.floor(sources))
+                        and np.all(targets == np.floor(targets))):
+                    error_handler("Ids failed type check", "Type")
+                sources = sources.astype(np.int64)
+                targets = targets.astype(np.int64)
+
+        sources = np.asarray(sources)
+        targets = np.asarray(targets)
+        if sources.size == 0:
+            sources = sources.astype(np.int64)
+        if targets.size == 0:
+            targets = targets.astype(np.int64)
+        Validator.check_ids(sources, self)
+        Validator.check_ids(targets, self)
+        if sources.shape != targets.shape:
+            error_handler("Sources and targets differ in length", "Index")
+
+        weights = np.asarray(weights)
+        if weights.ndim == 0:
+            weights = np.full(sources.shape, weights)
+        if weights.shape != sources.shape:
+            error_handler("Weights and ids differ in length", "Index")
+        if weights.dtype.kind not in 'iuf' and weights.size:
+            error_handler("Weights failed type check", "Type")
+        return sources, targets, weights
+
+    @ _synchronized('read')
+    def copy(self, share_data: bool = False):
+        """
+        Returns deep copy (identical copy of object and its internal objects)
+        With share_data, nodes and edges are copied but node data is shared
+        by reference instead of deep copied
+
+        Args:
+            share_data (bool, optional): Whether to share node data by reference. Defaults to False.
+
+        Returns:
+            Graph: New graph object identical to original
+        """
+        if not isinstance(share_data, bool):
+            error_handler("share_data is not bool", "Type")
+        if not share_data:
+            graph = copy.deepcopy(self)
+        else:
+            graph = copy.copy(self)
+            graph.nodes = {id: Node(node.data, node.flag,
+                                    dict(node.edges) if node.edges else None)
+                           for id, node in self.nodes.items()}
+            if self.in_edges is not None:
+                graph.in_edges = {id: set(predecessors)
+                                  for id, predecessors in self.in_edges.items()}
+        # Every node of the copy is its own, and copies get their own lock
+        graph._owned = None
+        if self._lock is not None:
+            graph._lock = RWLock()
+        graph._uid = next(Graph._uids)
+        graph._free_ids = list(self._free_ids)
+        if self._in_degree is not None:
+            graph._in_degree = self._in_degree.copy()
+            graph._out_degree = self._out_degree.copy()
+        return graph
+
+    @ _synchronized('read')
+    def snapshot(self):
+        """
+        Returns a copy-on-write snapshot of the graph
+        Snapshot and original share Node objects, node data included. A node
+        is copied only when either graph changes its edges, so taking a
+        snapshot costs O(V) and unchanged nodes are never duplicated
+        Changing node.data or node.flag directly affects both graphs
+
+        Returns:
+            Graph: New graph sharing nodes with the original
+        """
+        graph = Graph(validation=self.validation, journal=self.journal,
+                      concurrent=self.concurrent, cache=self.cache,
+                      id_policy=self.id_policy)
+        graph.nodes = dict(self.nodes)
+        graph.last_id = self.last_id
+        graph._free_ids = list(self._free_ids)
+        if self._in_degree is not None:
+            graph._in_degree = self._in_degree.copy()
+            graph._out_degree = self._out_degree.copy()
+            graph._num_edges = self._num_edges
+            graph._total_weight = self._total_weight
+        # Neither graph may change the shared nodes in place anymore
+        graph._owned = set()
+        self._owned = set()
+        if self.in_edges is not None:
+            graph.in_edges = {id: set(predecessors)
+                              for id, predecessors in self.in_edges.items()}
+        return graph
+
+    def bfs(self, source_id: Type.idtype, max_depth: int = None):
+        """
+        Breadth-first traversal. See Traversal.bfs
+        While concurrent, holds the read lock until consumed or closed
+        """
+        return self._traverse(Traversal.bfs, Traversal._bfs, self,
+                              source_id, max_depth)
+
+    def dfs(self, source_id: Type.idtype, max_depth: int = None):
+        """
+        Depth-first traversal. See Traversal.dfs
+        While concurrent, holds the read lock until consumed or closed
+        """
+        return self._traverse(Traversal.dfs, Traversal._dfs, self,
+                              source_id, max_depth)
+
+    def bfs_layers(self, source_id: Type.idtype, max_depth: int = None):
+        """
+        Breadth-first traversal by layers. See Traversal.bfs_layers
+        While concurrent, holds the read lock until consumed or closed
+        """
+        return self._traverse(Traversal.bfs_layers, Traversal._bfs_layers,
+                              self, source_id, max_depth)
+
+    def subgraph(self, ids=None, predicate=None):
+        """
+        Returns a read-only view of part of the graph. See SubgraphView
+
+        Args:
+            ids (iterable, optional): Ids of the nodes in view. Defaults to None.
+            predicate (callable, optional): Called with node.flag, nodes where it
+                is true are in view. Defaults to None.
+
+        Returns:
+            SubgraphView: View over this graph
+        """
+        return SubgraphView(self, ids, predicate)
+
+    # Copies nodes ids and edges among them to a new compact graph
+    @ _synchronized('read')
+    def induced_subgraph(self, ids, get_ids: bool = False):
+        """
+        Returns a new graph with nodes ids and the edges among them, relabeled
+        to 0..len(ids) - 1 in the given order. Node data is shared by
+        reference and the result is not revalidated, so it runs in
+        O(len(ids) + their out degrees) whatever the size of this graph
+
+        Args:
+            ids (iterable): Ids of the nodes to keep. Repeated ids are kept once
+            get_ids (bool, optional): Whether to also return the original id of each
+                new id. Defaults to False.
+
+        Returns:
+            Graph: Induced subgraph
+            Graph, np.ndarray: Induced subgraph and original ids, with get_ids
+            Bool: False when failed
+        """
+        try:
+            position = {}
+            for id in ids:
+                if id not in self.nodes:
+                    error_handler("Node not found", "Key")
+                position.setdefault(id, len(position))
+
+            nodes = {}
+            for id, new_id in position.items():
+                node = self.nodes[id]
+                edges = {position[target_id]: weight
+                         for target_id, weight in node.edges.items()
+                         if target_id in position}
+                nodes[new_id] = Node(node.data, node.flag, edges or None)
+
+            graph = Graph(validation=self.validation, journal=self.journal,
+                          concurrent=self.concurrent, cache=self.cache,
+                          id_policy=self.id_policy)
+            graph.nodes = nodes
+            graph.last_id = len(nodes) - 1
+            if self.in_edges is not None:
+                graph.set_reverse_index(True)
+            if self._in_degree is not None:
+                graph.set_counters(True)
+            if get_ids:
+                return graph, np.fromiter(position, dtype=np.int64,
+                                          count=len(position))
+            return graph
+        except:
+            error_handler("Broken ids in induced_subgraph", "Runtime")
+            return False
+
+    @ _synchronized('read')
+    def freeze(self):
+        """
+        Returns an immutable array-backed (CSR) copy of the graph
+        Node data and flags are shared by reference
+
+        Returns:
+            FrozenGraph: Frozen graph with the same ids, edges and node data
+        """
+        return FrozenGraph(self)
+
+# =============================================================================
+
+
+# Read-only view over part of a graph
+class SubgraphView():
+    """
+    Read-only view over part of a Graph
+    Nodes in view are those in ids, or those whose flag satisfies predicate,
+    and edges are those between them. Nothing is copied: nodes are looked
+    up in the parent graph, so its changes show through the view
+    Works with Traversal, which only needs successors(id) and 'in'. Other
+    algorithms need a materialized graph: use induced_subgraph()
+    On concurrent graphs, each call reads under the parent's read lock, and
+    traversals hold it until consumed or closed
+    """
+
+    def __init__(self, graph: Graph,
+                 ids=None,
+                 predicate=None):
+        """
+        Args:
+            graph (Graph): Parent graph
+            ids (iterable, optional): Ids of the nodes in view. Defaults to None.
+            predicate (callable, optional): Called with node.flag, nodes where it
+                is true are in view. Defaults to None.
+        """
+        if not isinstance(graph, Graph):
+            error_handler("graph is not a Graph", "Type")
+        if (ids is None) == (predicate is None):
+            error_handler("Give either ids or predicate", "Value")
+        if predicate is not None and not callable(predicate):
+            error_handler("predicate is not callable", "Type")
+        self.graph = graph
+        self.ids = None if ids is None else frozenset(ids)
+        self.predicate = predicate
+
+    def __contains__(self, id):
+        node = self.graph.nodes.get(id)
+        if node is None:
+            return False
+        if self.ids is not None:
+            return id in self.ids
+        return bool(self.predicate(node.flag))
+
+    def __iter__(self):
+        if self.graph._lock is not None:
+            return self.graph._locked_iter(self._ids())
+        return self._ids()
+
+    # Ids in view. Nodes are only iterated once the generator runs, so a
+    # locked iteration never sees a dict changed before the lock was taken
+    def _ids(self):
+        if self.ids is not None:
+            for id in self.ids:
+                if id in self.graph.nodes:
+                    yield id
+        else:
+            for id, node in self.graph.nodes.items():
+                if self.predicate(node.flag):
+                    yield id
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    @ property
+    def size(self):
+        return self.__len__()
+
+    def node(self, id: Type.idtype):
+        """
+        Returns the parent's Node object of id
+
+        Args:
+            id (Type.idtype): Node id
+
+        Returns:
+            Node: Node in view
+            Bool: False when node is not in view
+        """
+        if id not in self:
+            error_handler("Node not in view", "Key")
+            return False
+        return self.graph.nodes[id]
+
+    def successors(self, id: Type.idtype):
+        """
+        Returns ids in view that node id has an edge to
+
+        Args:
+            id (Type.idtype): Node id
+
+        Returns:
+            list: Target ids
+        """
+        with self.graph.read():
+            if id not in self:
+                error_handler("Node not in view", "Key")
+            return [target_id for target_id in self.graph.nodes[id].edges
+                    if target_id in self]
+
+    def neighbors(self, id: Type.idtype):
+        """
+        Returns edges of node id within the view
+
+        Args:
+            id (Type.idtype): Node id
+
+        Returns:
+            list: (target_id, weight) pairs
+        """
+        with self.graph.read():
+            if id not in self:
+                error_handler("Node not in view", "Key")
+            return [(target_id, weight)
+                    for target_id, weight in self.graph.nodes[id].edges.items()
+                    if target_id in self]
+
+    def bfs(self, source_id: Type.idtype, max_depth: int = None):
+        """
+        Breadth-first traversal within the view. See Traversal.bfs
+        """
+        return self.graph._traverse(Traversal.bfs, Traversal._bfs, self,
+                                    source_id, max_depth)
+
+    def dfs(self, source_id: Type.idtype, max_depth: int = None):
+        """
+        Depth-first traversal within the view. See Traversal.dfs
+        """
+        return self.graph._traverse(Traversal.dfs, Traversal._dfs, self,
+                                    source_id, max_depth)
+
+    def bfs_layers(self, source_id: Type.idtype, max_depth: int = None):
+        """
+        Breadth-first traversal by layers within the view. See Traversal.bfs_layers
+        """
+        return self.graph._traverse(Traversal.bfs_layers,
+                                    Traversal._bfs_layers, self,
+                                    source_id, max_depth)
+
+    def induced_subgraph(self, get_ids: bool = False):
+        """
+        Materializes the view. See Graph.induced_subgraph
+        """
+        with self.graph.read():
+            return self.graph.induced_subgraph(sorted(self), get_ids)
+
+# =============================================================================
+
+
+# Frozen graph class. Immutable compressed sparse row (CSR) graph
+class FrozenGraph():
+    """
+    Frozen graph class
+    Immutable compressed sparse row (CSR) representation of a Graph
+    Meant for read-heavy workloads. Use Graph.freeze() to build it and
+    thaw() to get a mutable Graph back
+
+    Nodes are stored in rows sorted by id:
+        ids[row] is the node id of each row
+        indptr[row]:indptr[row + 1] is the slice of its edges
+        indices holds target rows, sorted within each row
+        weights holds edge weights, parallel to indices
+        data and flags are lists parallel to ids
+    """
+
+    def __init__(self, graph: Graph):
+        """
+        Builds CSR arrays from a graph
+
+        Args:
+            graph (Graph): Graph to be frozen
+        """
+        if not isinstance(graph, Graph):
+            error_handler("Only a Graph can be frozen", "Type")
+        ids = sorted(graph.nodes)
+        rows = {id: row for row, id in enumerate(ids)}
+        nodes = [graph.nodes[id] for id in ids]
+
+        degrees = np.fromiter((len(node.edges) for node in nodes),
+                              dtype=np.int64, count=len(nodes))
+        indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+        np.cumsum(degrees, out=indptr[1:])
+        num_edges = int(indptr[-1])
+
+        indices = np.fromiter((rows[target] for node in nodes
+                               for target in node.edges),
+                              dtype=np.int64, count=num_edges)
+        weights = np.array([weight for node in nodes
+                            for weight in node.edges.values()])
+        if not num_edges:
+            weights = weights.astype(np.int64)
+
+        # Sorts targets within each row, so edge lookup is a binary search
+        sources = np.repeat(np.arange(len(nodes), dtype=np.int64), degrees)
+        order = np.lexsort((indices, sources))
+
+        self.graph_id = graph.graph_id
+        self.last_id = graph.last_id
+        self.ids = np.array(ids, dtype=np.int64)
+        self.indptr = indptr
+        self.indices = indices[order]
+        self.weights = weights[order]
+        self._data = [node.data for node in nodes]
+        self._flags = [node.flag for node in nodes]
+        self._node_loader = None
+        for array in (self.ids, self.indptr, self.indices, self.weights):
+            array.flags.writeable = False
+
+    # Builds a frozen graph straight from its arrays
+    @ classmethod
+    def _from_arrays(cls, ids, indptr, indices, weights, last_id,
+                     graph_id=None, data=None, flags=None, node_loader=None):
+        """
+        Builds a frozen graph from CSR arrays, which are used as they are
+        (e.g. memory-mapped). Used internally by Builder.from_binary
+
+        Args:
+            node_loader (callable, optional): Returns (data, flags) lists. Called
+                the first time data or flags are read. Defaults to None.
+
+        Returns:
+            FrozenGraph: Frozen graph over the given arrays
+        """
+        graph = cls.__new__(cls)
+        graph.graph_id = graph_id
+        graph.last_id = last_id
+        graph.ids = ids
+        graph.indptr = indptr
+        graph.indices = indices
+        graph.weights = weights
+        graph._data = data
+        graph._flags = flags
+        graph._node_loader = node_loader
+        return graph
+
+    # Node data and flags, loaded on first use when stored apart
+    @ property
+    def data(self):
+        if self._data is None:
+            self._load_nodes()
+        return self._data
+
+    @ property
+    def flags(self):
+        if self._flags is None:
+            self._load_nodes()
+        return self._flags
+
+    def _load_nodes(self):
+        if self._node_loader is None:
+            self._data = [None] * len(self)
+            self._flags = [None] * len(self)
+        else:
+            self._data, self._flags = self._node_loader()
+            self._node_loader = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, id):
+        row = np.searchsorted(self.ids, id)
+        return bool(row < len(self.ids) and self.ids[row] == id)
+
+    @ property
+    def size(self):
+        return self.__len__()
+
+    @ property
+    def num_edges(self):
+        return len(self.indices)
+
+    def row(self, id: Type.idtype):
+        """
+        Returns the row holding node id
+
+        Args:
+            id (Type.idtype): Node id
+
+        Returns:
+            int: Row of the node
+            Bool: False when node is not found
+        """
+        if id not in self:
+            error_handler("Node not found", "Key")
+            return False
+        return int(np.searchsorted(self.ids, id))
+
+    def neighbors(self, id: Type.idtype):
+        """
+        Iterates over edges leaving node id
+
+        Args:
+            id (Type.idtype): Node id
+
+        Yields:
+            (Type.idtype, Type.weighttype): Target id and edge weight
+        """
+        row = self.row(id)
+        start, end = self.indptr[row], self.indptr[row + 1]
+        targets = self.ids[self.indices[start:end]].tolist()
+        yield from zip(targets, self.weights[start:end].tolist())
+
+    def degree(self, id: Type.idtype):
+        """
+        Returns number of edges leaving node id
+
+        Args:
+            id (Type.idtype): Node id
+
+        Returns:
+            int: Out degree of the node
+        """
+        row = self.row(id)
+        return int(self.indptr[row + 1] - self.indptr[row])
+
+    def degrees(self):
+        """
+        Returns out degree of every row
+
+        Returns:
+            np.ndarray: Out degrees, parallel to ids
+        """
+        return np.diff(self.indptr)
+
+    def get_edge(self, source_id: Type.idtype, target_id: Type.idtype):
+        """
+        Looks up edge source_id -> target_id in O(log degree)
+
+        Args:
+            source_id (Type.idtype): Edge origin node
+            target_id (Type.idtype): Edge target node
+
+        Returns:
+            Type.weighttype: Edge weight
+            None: When edge is not found
+        """
+        if target_id not in self:
+            return None
+        row = self.row(source_id)
+        target = np.searchsorted(self.ids, target_id)
+        start, end = self.indptr[row], self.indptr[row + 1]
+        pos = start + np.searchsorted(self.indices[start:end], target)
+        if pos < end and self.indices[pos] == target:
+            return self.weights[pos].item()
+        return None
+
+    def has_edge(self, source_id: Type.idtype, target_id: Type.idtype):
+        return self.get_edge(source_id, target_id) is not None
+
+    def successors(self, id: Type.idtype):
+        """
+        Iterates over ids that node id has an edge to
+
+        Args:
+            id (Type.idtype): Node id
+
+        Returns:
+            Iterator: Target ids
+        """
+        row = self.row(id)
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return iter(self.ids[self.indices[start:end]].tolist())
+
+    # Row adjacency as python lists, built once. Traversals run on it
+    def _row_lists(self):
+        if not hasattr(self, '_rows'):
+            indptr = self.indptr.tolist()
+            indices = self.indices.tolist()
+            self._rows = [indices[indptr[row]:indptr[row + 1]]
+                          for row in range(len(self.ids))]
+        return self._rows
+
+    # Weighted row adjacency as lists of (row, weight), built once
+    def _weighted_row_lists(self):
+        if not hasattr(self, '_weighted_rows'):
+            indptr = self.indptr.tolist()
+            edges = list(zip(self.indices.tolist(), self.weights.tolist()))
+            self._weighted_rows = [edges[indptr[row]:indptr[row + 1]]
+                                   for row in range(len(self.ids))]
+        return self._weighted_rows
+
+    def bfs(self, source_id: Type.idtype, max_depth: int = None):
+        """
+        Breadth-first traversal. See Traversal.bfs
+        """
+        return Traversal.bfs(self, source_id, max_depth)
+
+    def dfs(self, source_id: Type.idtype, max_depth: int = None):
+        """
+        Depth-first traversal. See Traversal.dfs
+        """
+        return Traversal.dfs(self, source_id, max_depth)
+
+    def bfs_layers(self, source_id: Type.idtype, max_depth: int = None):
+        """
+        Breadth-first traversal by layers. See Traversal.bfs_layers
+        """
+        return Traversal.bfs_layers(self, source_id, max_depth)
+
+    def thaw(self):
+        """
+        Returns a mutable Graph with the same ids, edges and node data
+        Node data is shared by reference
+
+        Returns:
+            Graph: New mutable graph
+        """
+        ids = self.ids.tolist()
+        targets = self.ids[self.indices].tolist()
+        weights = self.weights.tolist()
+        indptr = self.indptr.tolist()
+        nodes = {}
+        for row, id in enumerate(ids):
+            start, end = indptr[row], indptr[row + 1]
+            edges = None
+            if end > start:
+                edges = dict(zip(targets[start:end], weights[start:end]))
+            nodes[id] = Node(data=self.data[row], flag=self.flags[row],
+                             edges=edges)
+        graph = Graph(nodes=nodes)
+        graph.last_id = self.last_id
+        return graph
+
+# =============================================================================
+
+
+# Traversals. Iterative and lazy, so callers may stop early
+class Traversal():
+    """
+    Graph traversal methods
+    Work on Graph, FrozenGraph or any graph with successors(id) and 'in'
+    Traversals are generators: nodes are only visited as they are consumed
+    """
+
+    # Checks traversal arguments
+    @ staticmethod
+    def _check(graph, source_id, max_depth):
+        if source_id not in graph:
+            error_handler("Source node not found", "Key")
+        if max_depth is not None:
+            if not isinstance(max_depth, int) or max_depth < 0:
+                error_handler("max_depth is not a non negative int", "Value")
+
+    # Checks and binds a traversal only once it runs
+    @ staticmethod
+    def _deferred(walk, graph, source_id, max_depth):
+        """
+        Generator form of a traversal: _check and _adjacency run on first
+        next(), so a caller may take a lock before anything is looked up
+        """
+        Traversal._check(graph, source_id, max_depth)
+        if source_id not in graph:
+            return
+        yield from walk(*Traversal._adjacency(graph, source_id), max_depth)
+
+    # Returns source key, neighbor lookup and key to id conversion
+    @ staticmethod
+    def _adjacency(graph, source_id):
+        """
+        Returns what traversals need to walk graph
+        Frozen graphs are walked over row numbers, others over ids
+
+        Returns:
+            (key, callable, callable): Source key, key -> iterable of
+                neighbor keys, key -> node id
+        """
+        if isinstance(graph, FrozenGraph):
+            rows = graph._row_lists()
+            ids = graph.ids.tolist()
+            return graph.row(source_id), rows.__getitem__, ids.__getitem__
+        if isinstance(graph, Graph):
+            nodes = graph.nodes
+            return source_id, lambda id: nodes[id].edges, lambda id: id
+        return source_id, graph.successors, lambda id: id
+
+    @ staticmethod
+    def bfs(graph, source_id: Type.idtype, max_depth: int = None):
+        """
+        Breadth-first traversal from source_id
+
+        Args:
+            graph (Graph or FrozenGraph): Graph to be traversed
+            source_id (Type.idtype): Starting node
+            max_depth (int, optional): Nodes further than this are not visited. Defaults to None.
+
+        Returns:
+            Iterator: Node ids in visiting order, source first
+        """
+        Traversal._check(graph, source_id, max_depth)
+        return Traversal._bfs(*Traversal._adjacency(graph, source_id),
+                              max_depth)
+
+    @ staticmethod
+    def _bfs(source, neighbors, to_id, max_depth):
+        visited = {source}
+        queue = collections.deque([(source, 0)])
+        while queue:
+            key, depth = queue.popleft()
+            yield to_id(key)
+            if depth == max_depth:
+                continue
+            for neighbor in neighbors(key):
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    queue.append((neighbor, depth + 1))
+
+    @ staticmethod
+    def bfs_layers(graph, source_id: Type.idtype, max_depth: int = None):
+        """
+        Breadth-first traversal from source_id, one layer at a time
+
+        Args:
+            graph (Graph or FrozenGraph): Graph to be traversed
+            source_id (Type.idtype): Starting node
+            max_depth (int, optional): Last layer to be visited. Defaults to None.
+
+        Returns:
+            Iterator: Lists of node ids, one per depth, starting with [source_id]
+        """
+        Traversal._check(graph, source_id, max_depth)
+        return Traversal._bfs_layers(*Traversal._adjacency(graph, source_id),
+                                     max_depth)
+
+    @ staticmethod
+    def _bfs_layers(source, neighbors, to_id, max_depth):
+        visited = {source}
+        layer = [source]
+        depth = 0
+        while layer:
+            yield [to_id(key) for key in layer]
+            if depth == max_depth:
+                return
+            next_layer = []
+            for key in layer:
+                for neighbor in neighbors(key):
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        next_layer.append(neighbor)
+            layer = next_layer
+            depth += 1
+
+    @ staticmethod
+    def dfs(graph, source_id: Type.idtype, max_depth: int = None):
+        """
+        Depth-first traversal from source_id
+        Iterative, so deep graphs do not hit the recursion limit. Visits
+        nodes in the same order as the usual recursive version
+
+        Args:
+            graph (Graph or FrozenGraph): Graph to be traversed
+            source_id (Type.idtype): Starting node
+            max_depth (int, optional): Nodes deeper than this are not visited. Defaults to None.
+
+        Returns:
+            Iterator: Node ids in visiting (preorder) order, source first
+        """
+        Traversal._check(graph, source_id, max_depth)
+        return Traversal._dfs(*Traversal._adjacency(graph, source_id),
+                              max_depth)
+
+    @ staticmethod
+    def _dfs(source, neighbors, to_id, max_depth):
+        visited = {source}
+        yield to_id(source)
+        if max_depth == 0:
+            return
+        # Stack of neighbor iterators, one per node on the current path
+        stack = [iter(neighbors(source))]
+        while stack:
+            for neighbor in stack[-1]:
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    yield to_id(neighbor)
+                    if len(stack) != max_depth:
+                        stack.append(iter(neighbors(neighbor)))
+                    break
+            else:
+                stack.pop()
+
+# =============================================================================
+
+
+# Shortest paths
+class Paths():
+    """
+    Shortest path methods
+    Work on Graph and FrozenGraph. Edge weights are used as distances
+    """
+
+    # Rejects graphs with negative weights
+    @ staticmethod
+    def _check_weights(graph):
+        if isinstance(graph, FrozenGraph):
+            negative = graph.num_edges and graph.weights.min() < 0
+        else:
+            negative = any(weight < 0 for node in graph.nodes.values()
+                           for weight in node.edges.values())
+        if negative:
+            error_handler("Negative edge weight. Dijkstra needs weights >= 0",
+                          "Value")
+
+    # Normalizes sources to a list of ids in graph
+    @ staticmethod
+    def _source_list(graph, sources):
+        if isinstance(sources, (int, np.integer)):
+            sources = [sources]
+        sources = [int(source) for source in sources]
+        if not sources:
+            error_handler("No source given", "Value")
+        for source in sources:
+            if source not in graph:
+                error_handler("Source node not found", "Key")
+        return sources
+
+    @ staticmethod
+    @ _reads_graph
+    def dijkstra(graph, sources, target: Type.idtype = None,
+                 predecessors: bool = False):
+        """
+        Heap-based Dijkstra from one source or from several at once
+        With several sources, each node gets its distance to the closest one
+
+        Args:
+            graph (Graph or FrozenGraph): Graph with non negative weights
+            sources (Type.idtype or iterable): Source id(s)
+            target (Type.idtype, optional): Stops as soon as its distance is known. Defaults to None.
+            predecessors (bool, optional): Whether to track predecessors for path reconstruction. Defaults to False.
+
+        Returns:
+            dict: {id: distance} of every reached node (settled ones when
+                stopping at target)
+            dict, dict: Distances and {id: predecessor id}, None for sources,
+                when predecessors is True
+            Bool: False when failed
+        """
+        try:
+            Paths._check_weights(graph)
+            sources = Paths._source_list(graph, sources)
+            if target is not None and target not in graph:
+                error_handler("Target node not found", "Key")
+
+            if isinstance(graph, FrozenGraph):
+                rows = graph._weighted_row_lists()
+                ids = graph.ids.tolist()
+                keys = [graph.row(source) for source in sources]
+                target_key = None if target is None else graph.row(target)
+                neighbors = rows.__getitem__
+            else:
+                nodes = graph.nodes
+                ids = None
+                keys = sources
+                target_key = target
+                neighbors = lambda id: nodes[id].edges.items()
+
+            dist, pred = Paths._dijkstra(keys, neighbors, target_key,
+                                         predecessors)
+            if ids is not None:
+                dist = {ids[key]: value for key, value in dist.items()}
+                pred = {ids[key]: None if value is None else ids[value]
+                        for key, value in pred.items()}
+            if predecessors:
+                return dist, pred
+            return dist
+        except:
+            error_handler("Broken graph in dijkstra", "Runtime")
+            return False
+
+    @ staticmethod
+    def _dijkstra(sources, neighbors, target, track):
+        """
+        Dijkstra over abstract keys. Used internally by dijkstra
+
+        Returns:
+            dict, dict: Settled distances and predecessors (empty unless track)
+        """
+        dist = {}
+        pred = {}
+        best = {}
+        heap = []
+        for source in sources:
+            best[source] = 0
+            heap.append((0, source))
+            if track:
+                pred[source] = None
+        heapq.heapify(heap)
+        while heap:
+            distance, key = heapq.heappop(heap)
+            if key in dist:
+                continue
+            dist[key] = distance
+            if key == target:
+                break
+            for neighbor, weight in neighbors(key):
+                candidate = distance + weight
+                if neighbor not in dist and candidate < best.get(neighbor, INF):
+                    best[neighbor] = candidate
+                    heapq.heappush(heap, (candidate, neighbor))
+                    if track:
+                        pred[neighbor] = key
+        if track:
+            pred = {key: pred[key] for key in dist}
+        return dist, pred
+
+    @ staticmethod
+    def path(predecessors: dict, target: Type.idtype):
+        """
+        Rebuilds a shortest path from Dijkstra predecessors
+
+        Args:
+            predecessors (dict): {id: predecessor id} from dijkstra
+            target (Type.idtype): Last node of the path
+
+        Returns:
+            list: Ids from source to target
+            Bool: False when target was not reached
+        """
+        if target not in predecessors:
+            error_handler("Target not reached", "Key")
+            return False
+        path = [target]
+        while predecessors[path[-1]] is not None:
+            path.append(predecessors[path[-1]])
+        path.reverse()
+        return path
+
+    @ staticmethod
+    @ _cached('dijkstra_batch')
+    def dijkstra_batch(graph, sources):
+        """
+        Runs single-source Dijkstra from each source on a static graph
+        The graph is frozen once and distance buffers are reused between
+        sources, so many queries avoid repeated setup
+
+        Args:
+            graph (Graph or FrozenGraph): Graph with non negative weights
+            sources (iterable): Source ids
+
+        Returns:
+            np.ndarray: (len(sources), last_id + 1) float distances, indexed
+                by node id. Unreached and removed ids are inf
+            Bool: False when failed
+        """
+        try:
+            if not isinstance(graph, FrozenGraph):
+                graph = graph.freeze()
+            Paths._check_weights(graph)
+            sources = Paths._source_list(graph, sources)
+            rows = graph._weighted_row_lists()
+            ids = graph.ids
+
+            result = np.full((len(sources), graph.last_id + 1), INF)
+            # Buffers reused by every source. Only touched rows are reset
+            best = [INF] * len(rows)
+            settled = [False] * len(rows)
+            for i, source in enumerate(sources):
+                key = graph.row(source)
+                best[key] = 0
+                touched = [key]
+                heap = [(0, key)]
+                while heap:
+                    distance, key = heapq.heappop(heap)
+                    if settled[key]:
+                        continue
+                    settled[key] = True
+                    for neighbor, weight in rows[key]:
+                        candidate = distance + weight
+                        if candidate < best[neighbor]:
+                            if best[neighbor] == INF:
+                                touched.append(neighbor)
+                            best[neighbor] = candidate
+                            heapq.heappush(heap, (candidate, neighbor))
+                touched = np.array(touched, dtype=np.int64)
+                result[i, ids[touched]] = [best[key] for key in touched.tolist()]
+                for key in touched.tolist():
+                    best[key] = INF
+                    settled[key] = False
+            return result
+        except:
+            error_handler("Broken graph in dijkstra_batch", "Runtime")
+            return False
+
+    @ staticmethod
+    @ _reads_graph
+    def all_pairs(graph: Graph, chunk_size: int = None):
+        """
+        All-pairs shortest paths with vectorized Floyd-Warshall
+        Runs on the dense float matrix from Converter.to_adjmatrix, with one
+        np.minimum per pivot. Meant for small, dense graphs (O(n^3) time)
+        By default each pivot needs n^2 temporary memory. With chunk_size,
+        rows are relaxed in blocks, bounding it to chunk_size * n
+        Negative weights are allowed, negative cycles are rejected
+
+        Args:
+            graph (Graph): Graph to be solved
+            chunk_size (int, optional): Rows relaxed at once. Defaults to None (all rows).
+
+        Returns:
+            np.ndarray, np.ndarray: (n, n) distances and next hops, n being
+                last_id + 1 and both indexed by node id. Unreachable pairs
+                are inf with next hop -1
+            Bool: False when failed
+        """
+        try:
+            # Copied: the matrix may be a cached result, shared with callers
+            dist = Converter.to_adjmatrix(graph, as_array=True,
+                                          fill=INF).copy()
+            n = len(dist)
+            if chunk_size is None:
+                chunk_size = max(n, 1)
+            if not isinstance(chunk_size, int) or chunk_size <= 0:
+                error_handler("chunk_size is not a positive int", "Value")
+
+            live = np.zeros(n, dtype=np.bool_)
+            live[list(graph.nodes)] = True
+            columns = np.arange(n, dtype=np.int64)
+            next_hop = np.where(np.isfinite(dist), columns, -1)
+            # A node reaches itself for free, unless through a negative loop
+            diagonal = np.minimum(np.diagonal(dist), 0)
+            dist[columns[live], columns[live]] = diagonal[live]
+            next_hop[columns[live], columns[live]] = columns[live]
+
+            for k in range(n):
+                pivot_row = dist[k].copy()
+                if not np.isfinite(pivot_row).any():
+                    continue
+                for start in range(0, n, chunk_size):
+                    block = dist[start:start + chunk_size]
+                    candidate = block[:, k, None] + pivot_row[None, :]
+                    improved = candidate < block
+                    np.minimum(block, candidate, out=block)
+                    hops = next_hop[start:start + chunk_size]
+                    np.copyto(hops, hops[:, k, None], where=improved)
+
+            if (np.diagonal(dist) < 0).any():
+                error_handler("Negative cycle found", "Value")
+            return dist, next_hop
+        except:
+            error_handler("Broken graph in all_pairs", "Runtime")
+            return False
+
+    @ staticmethod
+    def hop_path(next_hop: np.ndarray, source_id: Type.idtype,
+                 target_id: Type.idtype):
+        """
+        Rebuilds a shortest path from all_pairs next hops
+
+        Args:
+            next_hop (np.ndarray): Next hop matrix from all_pairs
+            source_id (Type.idtype): First node of the path
+            target_id (Type.idtype): Last node of the path
+
+        Returns:
+            list: Ids from source to target
+            Bool: False when target is unreachable
+        """
+        if next_hop[source_id, target_id] < 0:
+            error_handler("Target not reachable", "Key")
+            return False
+        path = [source_id]
+        while path[-1] != target_id:
+            path.append(int(next_hop[path[-1], target_id]))
+        return path
+
+# =============================================================================
+
+
+# Centrality measures
+class Centrality():
+    """
+    Centrality measures by power iteration
+    Each iteration is a vectorized sparse matrix-vector product over the
+    graph's CSR arrays. Work on Graph and FrozenGraph
+    Scores are float arrays of size last_id + 1, indexed by node id, with
+    0 for removed ids. They may be passed back as x0 to warm start a rerun,
+    also after nodes were added or removed
+    """
+
+    # Builds edge arrays shared by power iterations
+    @ staticmethod
+    def _edges(graph, weighted):
+        """
+        Returns the frozen graph and its edges as (source row, target row,
+        weight) arrays
+
+        Returns:
+            FrozenGraph, np.ndarray, np.ndarray, np.ndarray: Frozen graph,
+                sources, targets and float weights
+        """
+        if not isinstance(graph, FrozenGraph):
+            graph = graph.freeze()
+        if not isinstance(weighted, bool):
+            error_handler("weighted is not bool", "Type")
+        sources = np.repeat(np.arange(len(graph), dtype=np.int64),
+                            graph.degrees())
+        if weighted:
+            weights = graph.weights.astype(np.float64)
+            if weights.size and weights.min() < 0:
+                error_handler("Negative edge weight", "Value")
+        else:
+            weights = np.ones(graph.num_edges)
+        return graph, sources, graph.indices, weights
+
+    # Maps an id-indexed vector or {id: value} dict to rows
+    @ staticmethod
+    def _to_rows(graph, vector, name, warm: bool = False):
+        """
+        With warm, vector may be a result from before the graph changed:
+        entries of removed ids are skipped, and ids added since (past the
+        end of the vector) start with the uniform share
+        """
+        if vector is None:
+            return None
+        if isinstance(vector, dict):
+            rows = np.zeros(len(graph))
+            for id, value in vector.items():
+                if warm and id not in graph:
+                    continue
+                rows[graph.row(id)] = value
+        else:
+            vector = np.asarray(vector, dtype=np.float64)
+            if warm and vector.ndim == 1 and len(vector) < graph.last_id + 1:
+                known = graph.ids < len(vector)
+                rows = np.full(len(graph), 1 / len(graph))
+                previous = vector[graph.ids[known]]
+                if previous.sum() > 0:
+                    # Known ids keep their relative values and their total share
+                    previous = previous / previous.sum() * known.mean()
+                rows[known] = previous
+            else:
+                if vector.shape != (graph.last_id + 1,):
+                    error_handler(f"{name} must have one value per id", "Index")
+                rows = vector[graph.ids]
+        if (rows < 0).any() or not rows.sum() > 0:
+            error_handler(f"{name} must be non negative with a positive sum",
+                          "Value")
+        return rows / rows.sum()
+
+    # Maps row scores back to an id-indexed vector
+    @ staticmethod
+    def _to_ids(graph, rows):
+        vector = np.zeros(graph.last_id + 1)
+        vector[graph.ids] = rows
+        return vector
+
+    @ staticmethod
+    def _check_limits(tol, max_iter):
+        if not tol > 0:
+            error_handler("tol must be positive", "Value")
+        if not isinstance(max_iter, int) or max_iter <= 0:
+            error_handler("max_iter is not a positive int", "Value")
+
+    @ staticmethod
+    @ _cached('pagerank')
+    def pagerank(graph, alpha: float = 0.85,
+                 personalization=None,
+                 weighted: bool = False,
+                 tol: float = 1e-6,
+                 max_iter: int = 100,
+                 x0=None):
+        """
+        PageRank by power iteration
+        Rank of dangling nodes (no out edges) is spread following the
+        personalization vector
+
+        Args:
+            graph (Graph or FrozenGraph): Graph to be ranked
+            alpha (float, optional): Damping factor. Defaults to 0.85.
+            personalization (dict or array, optional): Teleport weights, as {id: value}
+                or indexed by id. Defaults to None (uniform).
+            weighted (bool, optional): Whether edges are followed in proportion to weight. Defaults to False.
+            tol (float, optional): Convergence tolerance, per node. Defaults to 1e-6.
+            max_iter (int, optional): Most iterations. Defaults to 100.
+            x0 (dict or array, optional): Starting ranks, e.g. a previous result. Defaults to None.
+
+        Returns:
+            np.ndarray: Ranks indexed by node id, summing to 1
+            Bool: False when failed or did not converge
+        """
+        try:
+            if not 0 <= alpha <= 1:
+                error_handler("alpha must be in [0, 1]", "Value")
+            Centrality._check_limits(tol, max_iter)
+            graph, sources, targets, weights = Centrality._edges(graph,
+                                                                 weighted)
+            n = len(graph)
+            if not n:
+                return np.zeros(graph.last_id + 1)
+
+            out_weight = np.bincount(sources, weights=weights, minlength=n)
+            dangling = out_weight == 0
+            # Share of each source's rank sent through each edge
+            share = weights / np.where(dangling, 1, out_weight)[sources]
+
+            teleport = Centrality._to_rows(graph, personalization,
+                                           "personalization")
+            if teleport is None:
+                teleport = np.full(n, 1 / n)
+            rank = Centrality._to_rows(graph, x0, "x0", warm=True)
+            if rank is None:
+                rank = np.full(n, 1 / n)
+
+            for _ in range(max_iter):
+                previous = rank
+                rank = np.bincount(targets, weights=previous[sources] * share,
+                                   minlength=n)
+                rank += previous[dangling].sum() * teleport
+                rank = alpha * rank + (1 - alpha) * teleport
+                if np.abs(rank - previous).sum() < n * tol:
+                    return Centrality._to_ids(graph, rank)
+            error_handler(f"pagerank did not converge in {max_iter} iterations",
+                          "Runtime")
+            return False
+        except:
+            error_handler("Broken graph in pagerank", "Runtime")
+            return False
+
+    @ staticmethod
+    @ _cached('eigenvector')
+    def eigenvector(graph, weighted: bool = False,
+                    tol: float = 1e-6,
+                    max_iter: int = 100,
+                    x0=None):
         """
-        Adds edge source_id -> target_id with weight when applicable
-        Adds edge symmetrically (if (a,b) in edges, then (b, a) also in edges)) when toggled
+        Eigenvector centrality by power iteration
+        A node scores high when nodes with edges into it score high
+        Iterates on (A + I), which has the same eigenvectors but converges
+        on bipartite graphs too
 
         Args:
-            source_id (Type.idtype): Edge origin node. Where edge is stored
-            target_id (Type.idtype): Edge target node. Key on edges in node[source_id]
-            weight (Type.weighttype, optional): Edge weight. Defaults to 0.
-            symmetric (bool, optional): Whether edge is to be added symmetrically. Defaults to False.
+            graph (Graph or FrozenGraph): Graph to be scored
+            weighted (bool, optional): Whether edge weights scale scores. Defaults to False.
+            tol (float, optional): Convergence tolerance, per node. Defaults to 1e-6.
+            max_iter (int, optional): Most iterations. Defaults to 100.
+            x0 (dict or array, optional): Starting scores, e.g. a previous result. Defaults to None.
 
         Returns:
-            Bool: Whether edge was added or not
+            np.ndarray: Scores indexed by node id, with unit euclidean norm
+            Bool: False when failed or did not converge
         """
         try:
-            Type.is_id(source_id)
-            Type.is_id(target_id)
-            Type.is_weight(weight)
-            if not isinstance(symmetric, bool):
-                error_handler("Symmetric is not bool", "Type")
+            Centrality._check_limits(tol, max_iter)
+            graph, sources, targets, weights = Centrality._edges(graph,
+                                                                 weighted)
+            n = len(graph)
+            if not n:
+                return np.zeros(graph.last_id + 1)
+
+            score = Centrality._to_rows(graph, x0, "x0", warm=True)
+            if score is None:
+                score = np.full(n, 1 / n)
+
+            for _ in range(max_iter):
+                previous = score
+                score = previous + np.bincount(
+                    targets, weights=previous[sources] * weights, minlength=n)
+                norm = np.linalg.norm(score)
+                if norm == 0:
+                    error_handler("Scores vanished. Graph has no usable edges",
+                                  "Runtime")
+                score = score / norm
+                if np.abs(score - previous / np.linalg.norm(previous)).sum() < n * tol:
+                    return Centrality._to_ids(graph, score)
+            error_handler(f"eigenvector did not converge in {max_iter} iterations",
+                          "Runtime")
+            return False
+        except:
+            error_handler("Broken graph in eigenvector", "Runtime")
+            return False
 
-            if not (source_id in self.nodes and target_id in self.nodes):
-                error_handler("Edge id not found", "Key")
+# =============================================================================
 
-            self.nodes[source_id].edges[target_id] = weight
-            logging.info(
-                f" Edge ({source_id}->{target_id} [{weight}]) added to graph #{self.graph_id}")
-            if VERBOSE:
-                logging.info(str(Converter.to_adjdict(self)))
-            if symmetric:
-                self.add_edge(target_id, source_id, weight)
-            return True
 
-        except:
-            error_handler("Edge's id(s) not in nodes", "Key")
-            return False
+# Connected components
+class Components():
+    """
+    Component labelling without recursion, so it scales to large graphs
+    Work on Graph and FrozenGraph
+    Results are a label array of size last_id + 1, indexed by node id, with
+    -1 for removed ids, plus the size of each component
+    """
 
-    def remove_edge(self, source_id: Type.idtype, target_id: Type.idtype, symmetric: bool = False):
+    # Maps row labels back to an id-indexed array
+    @ staticmethod
+    def _result(graph, row_labels):
+        labels = np.full(graph.last_id + 1, -1, dtype=np.int64)
+        labels[graph.ids] = row_labels
+        sizes = np.bincount(row_labels) if len(row_labels) else np.zeros(
+            0, dtype=np.int64)
+        return labels, sizes
+
+    @ staticmethod
+    @ _cached('weakly_connected')
+    def weakly_connected(graph):
         """
-        Removes edge source_id -> target_id
-        Removes edge symmetrically (if (a,b) in edges, then (b, a) also in edges)) when toggled
+        Weakly connected components (edge direction ignored)
+        Array-based union-find with union by size and path compression
 
         Args:
-            source_id (Type.idtype): Edge origin node. Where edge is stored
-            target_id (Type.idtype): Edge target node. Key on edges in node[source_id]
-            symmetric (bool, optional): Whether edge is to be removed symmetrically. Defaults to False.
+            graph (Graph or FrozenGraph): Graph to be labelled
 
         Returns:
-            Bool: Whether edge was removed or not
+            np.ndarray, np.ndarray: Component of each node id, and size of
+                each component
+            Bool: False when failed
         """
         try:
-            Type.is_id(source_id)
-            Type.is_id(target_id)
-            if not isinstance(symmetric, bool):
-                error_handler("Symmetric is not bool", "Type")
-
-            if not (source_id in self.nodes and target_id in self.nodes):
-                error_handler("Edge id not found", "Key")
-
-            if symmetric:
-                self.remove_edge(target_id, source_id)
-
-            node = self.nodes[source_id]
-            if node.edges:
-                if target_id in node.edges:
-                    node.edges.pop(target_id)
-                    logging.info(
-                        f" Edge ({source_id}->{target_id}) removed from graph #{self.graph_id}")
-                    if VERBOSE:
-                        logging.info(str(Converter.to_adjdict(self)))
-                    return True
-            error_handler("Edge not found", "Key")
+            if not isinstance(graph, FrozenGraph):
+                graph = graph.freeze()
+            n = len(graph)
+            parent = list(range(n))
+            size = [1] * n
+            sources = np.repeat(np.arange(n, dtype=np.int64),
+                                graph.degrees()).tolist()
+            for a, b in zip(sources, graph.indices.tolist()):
+                # Finds both roots, halving paths on the way
+                while parent[a] != a:
+                    parent[a] = parent[parent[a]]
+                    a = parent[a]
+                while parent[b] != b:
+                    parent[b] = parent[parent[b]]
+                    b = parent[b]
+                if a == b:
+                    continue
+                if size[a] < size[b]:
+                    a, b = b, a
+                parent[b] = a
+                size[a] += size[b]
+
+            roots = np.array(parent, dtype=np.int64)
+            # Flattens remaining chains, so every row points to its root
+            while True:
+                grand = roots[roots]
+                if (grand == roots).all():
+                    break
+                roots = grand
+            _, row_labels = np.unique(roots, return_inverse=True)
+            return Components._result(graph, row_labels.reshape(-1))
         except:
-            error_handler("Edge not found", "Key")
+            error_handler("Broken graph in weakly_connected", "Runtime")
             return False
 
-    # Adds nodes with data, flag and edges when applicable
-    def add_node(self, data: Type.datatype = None,
-                 flag: Type.flagtype = None,
-                 edges: Type.edgelist = None):
+    @ staticmethod
+    @ _cached('strongly_connected')
+    def strongly_connected(graph):
         """
-        Adds nodes with data, flag and edges when applicable
+        Strongly connected components with an iterative Tarjan algorithm
 
         Args:
-            data (Type.datatype, optional): Node data. Defaults to None.
-            flag (Type.flagtype, optional): Node flag. Defaults to None.
-            edges (Type.edgelist, optional): Node edges. Defaults to None.
+            graph (Graph or FrozenGraph): Graph to be labelled
 
         Returns:
-            Node: Returns added node object when valid
-            Bool: Returns False when failed adding node
+            np.ndarray, np.ndarray: Component of each node id, and size of
+                each component
+            Bool: False when failed
         """
-        if edges == None:
-            edges = {}
-        new_node = Node(data, flag, edges)
-        new_id = self.last_id + 1
         try:
-            Validator.check_node(new_node, self, _adding=True)
-            self.nodes[new_id] = new_node
-            self.last_id += 1
-
-            logging.info(f" Node #{new_id} added to graph #{self.graph_id}")
-            if VERBOSE:
-                logging.info(str(Converter.to_adjdict(self)))
-
-            return new_node
+            if not isinstance(graph, FrozenGraph):
+                graph = graph.freeze()
+            rows = graph._row_lists()
+            n = len(rows)
+            index = [-1] * n
+            low = [0] * n
+            on_stack = [False] * n
+            component = [-1] * n
+            stack = []
+            counter = 0
+            count = 0
+
+            for root in range(n):
+                if index[root] != -1:
+                    continue
+                index[root] = low[root] = counter
+                counter += 1
+                stack.append(root)
+                on_stack[root] = True
+                # Simulated call stack of (row, position of next neighbor)
+                work = [(root, 0)]
+                while work:
+                    v, position = work[-1]
+                    neighbors = rows[v]
+                    if position < len(neighbors):
+                        work[-1] = (v, position + 1)
+                        w = neighbors[position]
+                        if index[w] == -1:
+                            index[w] = low[w] = counter
+                            counter += 1
+                            stack.append(w)
+                            on_stack[w] = True
+                            work.append((w, 0))
+                        elif on_stack[w] and index[w] < low[v]:
+                            low[v] = index[w]
+                        continue
+                    work.pop()
+                    if work:
+                        u = work[-1][0]
+                        if low[v] < low[u]:
+                            low[u] = low[v]
+                    if low[v] == index[v]:
+                        while True:
+                            w = stack.pop()
+                            on_stack[w] = False
+                            component[w] = count
+                            if w == v:
+                                break
+                        count += 1
+
+            return Components._result(graph,
+                                      np.array(component, dtype=np.int64))
         except:
-            error_handler("Node not valid. Was not added", "Key")
+            error_handler("Broken graph in strongly_connected", "Runtime")
             return False
 
-    # Removes nodes and all edges pointing to it
-    def remove_node(self, id: Type.idtype):
+# =============================================================================
+
+
+# Multi-source algorithms over a process pool
+class Parallel():
+    """
+    Runs the same algorithm from many sources over a process pool
+    The graph is frozen and its CSR arrays are copied into shared memory
+    once. Workers attach to them instead of receiving a pickled graph, and
+    write their result rows straight into a shared output matrix
+    Work on Graph and FrozenGraph. Results are indexed by node id
+    """
+    # Graph attached by the current worker process
+    _worker = None
+
+    @ staticmethod
+    def dijkstra(graph, sources, workers: int = None, batch_size: int = None,
+                 start_method: str = None):
         """
-        Removes nodes and all edges pointing to it
+        Parallel version of Paths.dijkstra_batch
 
         Args:
-            id (Type.idtype): Id of the node to be removed
+            graph (Graph or FrozenGraph): Graph with non negative weights
+            sources (iterable): Source ids
+            workers (int, optional): Pool size. Defaults to os.cpu_count().
+            batch_size (int, optional): Sources per task. Defaults to an even split
+                in 4 tasks per worker.
+            start_method (str, optional): multiprocessing start method. Defaults to
+                the platform default.
 
         Returns:
-            Node: Node removed when valid
-            Bool: False when failed to find node
+            np.ndarray: (len(sources), last_id + 1) float distances. Unreached
+                and removed ids are inf
+            Bool: False when failed
         """
         try:
-            Type.is_id(id)
-            if id in self.nodes:
-                popped = self.nodes.pop(id)
-                if self.size > 0:
-                    for node in self.nodes.values():
-                        if node.edges:
-                            if id in node.edges:
-                                node.edges.pop(id)
-                logging.info(
-                    f" Node #{id} removed from graph #{self.graph_id}")
-                if VERBOSE:
-                    logging.info(
-                        str(Converter.to_adjdict(self)))
-                return popped
+            if not isinstance(graph, FrozenGraph):
+                graph = graph.freeze()
+            Paths._check_weights(graph)
+            return Parallel._run(graph, sources, 'dijkstra', None, np.float64,
+                                 INF, workers, batch_size, start_method)
         except:
-            error_handler("Node not found", "Key")
+            error_handler("Broken graph in parallel dijkstra", "Runtime")
             return False
 
-    def get_nodes(self):
-        return self.nodes
-
-    def copy(self):
+    @ staticmethod
+    def hops(graph, sources, max_depth: int = None, workers: int = None,
+             batch_size: int = None, start_method: str = None):
         """
-        Returns deep copy (identical copy of object and its internal objects)
+        Hop distance from each source, by vectorized frontier BFS
+        k-hop reachability of a source is (result[i] >= 0) & (result[i] <= k)
+
+        Args:
+            graph (Graph or FrozenGraph): Graph to be traversed
+            sources (iterable): Source ids
+            max_depth (int, optional): Maximum hops from each source. Defaults to None.
+            workers (int, optional): Pool size. Defaults to os.cpu_count().
+            batch_size (int, optional): Sources per task. Defaults to an even split
+                in 4 tasks per worker.
+            start_method (str, optional): multiprocessing start method. Defaults to
+                the platform default.
 
         Returns:
-            Graph: New graph object identical to original
+            np.ndarray: (len(sources), last_id + 1) int64 hop counts. Unreached
+                and removed ids are -1
+            Bool: False when failed
         """
-        return copy.deepcopy(self)
+        try:
+            if max_depth is not None and (not isinstance(max_depth, int)
+                                          or max_depth < 0):
+                error_handler("max_depth is not a non negative int", "Value")
+            if not isinstance(graph, FrozenGraph):
+                graph = graph.freeze()
+            return Parallel._run(graph, sources, 'hops', max_depth, np.int64,
+                                 -1, workers, batch_size, start_method)
+        except:
+            error_handler("Broken graph in parallel hops", "Runtime")
+            return False
+
+    # Shares graph, fans source batches out and gathers the result matrix
+    @ staticmethod
+    def _run(graph, sources, op, arg, dtype, fill, workers, batch_size,
+             start_method):
+        # multiprocessing is slow to import, so only worker pools load it
+        import multiprocessing
+        from multiprocessing import shared_memory
+        sources = Paths._source_list(graph, sources)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if not isinstance(workers, int) or workers < 1:
+            error_handler("workers is not a positive int", "Value")
+        if batch_size is None:
+            batch_size = -(-len(sources) // (4 * workers))
+        if not isinstance(batch_size, int) or batch_size < 1:
+            error_handler("batch_size is not a positive int", "Value")
+
+        rows = np.array([graph.row(source) for source in sources],
+                        dtype=np.int64)
+        arrays = {'ids': graph.ids, 'indptr': graph.indptr,
+                  'indices': graph.indices, 'weights': graph.weights,
+                  'sources': rows,
+                  'out': np.full((len(sources), graph.last_id + 1), fill,
+                                 dtype=dtype)}
+        blocks = []
+        try:
+            spec = {}
+            for name, array in arrays.items():
+                # Zero sized blocks are not allowed
+                block = shared_memory.SharedMemory(
+                    create=True, size=max(array.nbytes, 1))
+                blocks.append(block)
+                np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+                spec[name] = (block.name, array.shape, array.dtype.str)
+
+            tasks = [(op, start, min(start + batch_size, len(sources)), arg)
+                     for start in range(0, len(sources), batch_size)]
+            context = multiprocessing.get_context(start_method)
+            with context.Pool(min(workers, len(tasks)),
+                              initializer=Parallel._attach,
+                              initargs=(spec, graph.last_id)) as pool:
+                for _ in pool.imap_unordered(Parallel._task, tasks):
+                    pass
+            block = blocks[-1]
+            return np.ndarray(arrays['out'].shape, dtype,
+                              buffer=block.buf).copy()
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    # Worker initializer. Attaches to the shared arrays once
+    @ staticmethod
+    def _attach(spec, last_id):
+        from multiprocessing import shared_memory
+        blocks, arrays = [], {}
+        for name, (block_name, shape, dtype) in spec.items():
+            block = shared_memory.SharedMemory(name=block_name)
+            blocks.append(block)
+            arrays[name] = np.ndarray(shape, dtype, buffer=block.buf)
+        out, rows = arrays.pop('out'), arrays.pop('sources')
+        graph = FrozenGraph._from_arrays(last_id=last_id, **arrays)
+        # Blocks are kept referenced so their buffers stay mapped
+        Parallel._worker = (graph, rows, out, blocks)
+
+    # Runs one batch of sources in a worker
+    @ staticmethod
+    def _task(task):
+        op, start, end, arg = task
+        graph, rows, out, _ = Parallel._worker
+        if op == 'dijkstra':
+            out[start:end] = Paths.dijkstra_batch(
+                graph, graph.ids[rows[start:end]].tolist())
+        else:
+            for i in range(start, end):
+                Parallel._hop_row(graph, rows[i], arg, out[i])
+
+    # Frontier BFS over CSR arrays, writing hop counts by id into out
+    @ staticmethod
+    def _hop_row(graph, source_row, max_depth, out):
+        indptr, indices = graph.indptr, graph.indices
+        depth = np.full(len(graph.ids), -1, dtype=np.int64)
+        depth[source_row] = 0
+        frontier = np.array([source_row], dtype=np.int64)
+        level = 0
+        while len(frontier) and (max_depth is None or level < max_depth):
+            level += 1
+            starts = indptr[frontier]
+            lengths = indptr[frontier + 1] - starts
+            total = int(lengths.sum())
+            if not total:
+                break
+            # Positions of every out edge of the frontier, without a loop
+            offsets = np.repeat(starts - (np.cumsum(lengths) - lengths),
+                                lengths) + np.arange(total)
+            reached = indices[offsets]
+            frontier = np.unique(reached[depth[reached] < 0])
+            depth[frontier] = level
+        out[graph.ids] = depth
 
 # =============================================================================
 
@@ -531,12 +3318,16 @@ class Validator():
 
     # Checks whether graph is valid
     @ staticmethod
-    def is_graph(graph: Graph):
+    @ _reads_graph
+    def is_graph(graph: Graph, level: str = None):
         """
         Validates the entire graph
+        Node list is type checked once, then every node is checked
+        incrementally, so the whole check runs in O(V+E)
 
         Args:
             graph (Graph): Graph to be checked
+            level (str, optional): Validation level. Defaults to the graph's level.
 
         Returns:
             Bool: Whether the graph is valid or not
@@ -546,17 +3337,20 @@ class Validator():
 
             last_id = graph.last_id
 
-            if not nodes:
+            if level is None:
+                level = graph.validation_level
+            if not nodes or level == 'off':
                 # Empty graph is a valid graph
                 return True
 
-            Type.is_nodelist(nodes)
+            Type.is_nodelist(nodes, level)
             for key, node in nodes.items():
                 id_range = key <= last_id
                 id_checks = id_range
                 if not id_checks:
                     error_handler("Id not in graph range", "Index")
-                Validator.check_node(node, graph)
+                Validator.check_node(node, graph, incremental=True,
+                                     level=level)
             return True
         except:
             error_handler("Graph failed type check", "Type")
@@ -564,7 +3358,8 @@ class Validator():
 
     # Checks whether node is valid
     @ staticmethod
-    def check_node(node: Type.nodetype, graph: Graph, _adding=False):
+    def check_node(node: Type.nodetype, graph: Graph, _adding=False,
+                   incremental=False, level: str = None):
         """
         Checks whether node is valid
         Also used internally by Graph to check new nodes
@@ -574,29 +3369,109 @@ class Validator():
             node (Type.nodetype): Node to be checked
             graph (Graph): Graph to which node belongs
             _adding (bool, optional): Used internally when adding new node. Defaults to False.
+            incremental (bool, optional): Whether to check only the node, trusting
+                the rest of the graph. Defaults to False.
+            level (str, optional): Validation level. Defaults to the graph's level.
 
         Returns:
             Bool: Whether or not node is valid
         """
         try:
-            Type.is_node(node)
-            check_type("graph", graph, Graph)
-            Type.is_nodelist(graph.nodes)
+            if not isinstance(graph, Graph):
+                error_handler("graph is not a Graph", "Type")
+            if level is None:
+                level = graph.validation_level
+            Type.is_node(node, level)
+            if not incremental:
+                Type.is_nodelist(graph.nodes, level)
             flag = node.flag
             if flag:
-                Type.is_flag(flag)
+                Type.is_flag(flag, level)
             if node.edges != {}:
-                Type.is_edgelist(node.edges)
+                Type.is_edgelist(node.edges, level)
+                # Weights were type checked along with the edge list
                 for key, weight in node.edges.items():
                     if key not in graph.nodes:
-                        if not (_adding and key == graph.last_id + 1):
+                        if not (_adding and key == graph._next_id()):
                             error_handler("Edge node not in nodes", "Key")
-                    Type.is_weight(weight)
+                    if weight is None and level != 'off':
+                        error_handler("Weight failed type check", "Type")
             return True
         except:
             error_handler("Node failed type check", "Type")
             return False
 
+    # Checks whether edge is valid
+    @ staticmethod
+    def check_edge(source_id: Type.idtype,
+                   target_id: Type.idtype,
+                   weight: Type.weighttype,
+                   graph: Graph,
+                   level: str = None):
+        """
+        Checks whether edge source_id -> target_id is valid in graph
+        Only the edge is checked, so it runs in constant time
+        Ids are always looked up in graph, even when level is 'off'
+
+        Args:
+            source_id (Type.idtype): Edge origin node
+            target_id (Type.idtype): Edge target node
+            weight (Type.weighttype): Edge weight
+            graph (Graph): Graph to which edge belongs
+            level (str, optional): Validation level. Defaults to the graph's level.
+
+        Returns:
+            Bool: Whether or not edge is valid
+        """
+        try:
+            if level is None:
+                level = graph.validation_level
+            Type.is_id(source_id, level)
+            Type.is_id(target_id, level)
+            Type.is_weight(weight, level)
+            if not (source_id in graph.nodes and target_id in graph.nodes):
+                error_handler("Edge id not found", "Key")
+            return True
+        except:
+            error_handler("Edge not valid", "Key")
+            return False
+
+    # Checks many ids at once
+    @ staticmethod
+    def check_ids(ids: npt.NDArray[np.integer], graph: Graph):
+        """
+        Checks an array of ids in one vectorized pass
+        Ids must be integral, non negative and present in graph
+        O(batch): ids are bounds checked against last_id, then distinct ids
+        are looked up in graph.nodes only when some ids were removed
+
+        Args:
+            ids (npt.NDArray[np.integer]): One dimensional id array
+            graph (Graph): Graph to which ids belong
+
+        Returns:
+            Bool: Whether or not all ids are valid
+        """
+        try:
+            ids = np.asarray(ids)
+            if ids.ndim != 1:
+                error_handler("Ids must be one dimensional", "Index")
+            if not ids.size:
+                return True
+            if ids.dtype.kind not in 'iu':
+                error_handler("Ids failed type check", "Type")
+            if ids.min() < 0 or ids.max() > graph.last_id:
+                error_handler("Id out of bounds", "Key")
+            # Without removed ids, every id up to last_id is live
+            if len(graph.nodes) != graph.last_id + 1:
+                nodes = graph.nodes
+                if not all(id in nodes for id in np.unique(ids).tolist()):
+                    error_handler("Id not found", "Key")
+            return True
+        except:
+            error_handler("Ids not valid", "Key")
+            return False
+
 # =============================================================================
 
 
@@ -609,13 +3484,19 @@ class Builder():
     # Advanced method to build graph from adjacency matrix
     @ staticmethod
     def adj_matrix(adj_mat: Type.adjmatrixtype,
-                   obj_list: List[Any] = None):
+                   obj_list: List[Any] = None,
+                   mask: npt.NDArray[np.bool_] = None):
         """
         Advanced method to build graph from adjacency matrix
+        Numpy matrices are read with vectorized np.nonzero. In them, "no edge"
+        is None (object arrays), NaN (float arrays), a masked entry
+        (np.ma.MaskedArray) or True in mask
 
         Args:
             adj_mat (Type.adjmatrixtype): Source adjacency matrix
             obj_list (List[Any], optional): Object list to go on 'node.data'. Defaults to None.
+            mask (npt.NDArray[np.bool_], optional): Boolean matrix, True where there
+                is no edge. Only for numpy matrices. Defaults to None.
 
         Returns:
             Graph: Built and checked graph
@@ -625,22 +3506,88 @@ class Builder():
 
         try:
             Type.is_adjmatrix(adj_mat)
-            for i, line in enumerate(adj_mat):
-                if obj_list:
-                    nodes[i] = Node(data=obj_list[i])
-                else:
-                    nodes[i] = Node()
-                for j, weight in enumerate(line):
-                    if weight != None:
-                        nodes[i].edges[j] = weight
-
-            logging.info(f" Adjacency matrix is valid. Graph is being built")
+            if isinstance(adj_mat, np.ndarray):
+                nodes = Builder._ndarray_nodes(adj_mat, obj_list, mask)
+            else:
+                if mask is not None:
+                    error_handler("mask requires a numpy matrix", "Type")
+                for i, line in enumerate(adj_mat):
+                    edges = {j: weight for j, weight in enumerate(line)
+                             if weight != None}
+                    if obj_list:
+                        nodes[i] = Node(data=obj_list[i], edges=edges or None)
+                    else:
+                        nodes[i] = Node(edges=edges or None)
+
+            logger.info(f" Adjacency matrix is valid. Graph is being built")
             return Graph(nodes=nodes)
 
         except:
             error_handler("Broken adjacency matrix", "Runtime")
             return False
 
+    # Builds node list from a numpy adjacency matrix
+    @ staticmethod
+    def _ndarray_nodes(adj_mat: np.ndarray,
+                       obj_list: List[Any] = None,
+                       mask: npt.NDArray[np.bool_] = None):
+        """
+        Builds node list from a numpy adjacency matrix with vectorized edge
+        extraction. Used internally by adj_matrix
+
+        Args:
+            adj_mat (np.ndarray): Square adjacency matrix
+            obj_list (List[Any], optional): Object list to go on 'node.data'. Defaults to None.
+            mask (npt.NDArray[np.bool_], optional): True where there is no edge. Defaults to None.
+
+        Returns:
+            Type.nodelisttype: Node list {id: Node}
+        """
+        if adj_mat.ndim != 2 or adj_mat.shape[0] != adj_mat.shape[1]:
+            error_handler("Adjmatrix not homogeneous", "Index")
+
+        if mask is not None:
+            mask = np.asarray(mask)
+            if mask.dtype != np.bool_ or mask.shape != adj_mat.shape:
+                error_handler("mask must be a boolean matrix shaped as adjmatrix",
+                              "Type")
+            present = ~mask
+        elif isinstance(adj_mat, np.ma.MaskedArray):
+            present = ~np.ma.getmaskarray(adj_mat)
+        elif adj_mat.dtype == object:
+            present = np.not_equal(adj_mat, None)
+        elif adj_mat.dtype.kind == 'f':
+            present = ~np.isnan(adj_mat)
+        elif adj_mat.dtype.kind in 'iu':
+            present = np.ones(adj_mat.shape, dtype=np.bool_)
+        else:
+            error_handler("Adjmatrix dtype is not a weight type", "Type")
+
+        sources, targets = np.nonzero(present)
+        # tolist converts numpy scalars back to native int and float
+        weights = np.asarray(adj_mat)[sources, targets].tolist()
+        if adj_mat.dtype == object:
+            for weight in weights:
+                Type.is_weight(weight)
+        targets = targets.tolist()
+
+        n = adj_mat.shape[0]
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+        indptr = indptr.tolist()
+
+        nodes = {}
+        for i in range(n):
+            start, end = indptr[i], indptr[i + 1]
+            edges = None
+            if end > start:
+                edges = dict(zip(targets[start:end], weights[start:end]))
+            if obj_list is not None and len(obj_list):
+                nodes[i] = Node(data=obj_list[i], edges=edges)
+            else:
+                nodes[i] = Node(edges=edges)
+        return nodes
+
     # Advanced method to build graph from adjacency list
     @ staticmethod
     def adj_list(adj_list: Type.adjlisttype,
@@ -661,14 +3608,13 @@ class Builder():
         try:
             Type.is_adjlist(adj_list)
             for i, edgelist in enumerate(adj_list):
+                edges = {j: weight for j, weight in edgelist}
                 if obj_list:
-                    nodes[i] = Node(data=obj_list[i])
+                    nodes[i] = Node(data=obj_list[i], edges=edges or None)
                 else:
-                    nodes[i] = Node()
-                for j, weight in edgelist:
-                    nodes[i].edges[j] = weight
+                    nodes[i] = Node(edges=edges or None)
 
-            logging.info(f" Adjacency list is valid. Graph is being built")
+            logger.info(f" Adjacency list is valid. Graph is being built")
             return Graph(nodes=nodes)
         except:
             error_handler("Broken adjacency list", "Runtime")
@@ -698,7 +3644,7 @@ class Builder():
                     nodes[i] = Node(data=obj_list[i])
                 else:
                     nodes[i] = Node(edges=edgelist)
-            logging.info(
+            logger.info(
                 f" Adjacency dictionary is valid. Graph is being built")
             return Graph(nodes=nodes)
         except:
@@ -710,8 +3656,7 @@ class Builder():
     def refactor(graph: Graph):
         """
         Refactors graph to clean "waste"
-        Clears node flags
-        Removes unused node ids
+        Removes unused node ids. Same as compact(graph)
 
         Args:
             graph (Graph): Graph to be cleaned
@@ -720,21 +3665,239 @@ class Builder():
             Graph: Refactored graph
             Bool: False when failed to refactor
         """
+        return Builder.compact(graph)
+
+    # Renumbers node ids to 0..size - 1
+    @ staticmethod
+    def compact(graph: Graph, in_place: bool = False, get_map: bool = False):
+        """
+        Renumbers node ids to 0..size - 1, keeping their order, data and flags
+        An old -> new id array is built in one pass and every edge key is
+        rewritten through it, so it runs in O(last_id + E) without
+        revalidating the graph. Node data is shared by reference in copies
+
+        Args:
+            graph (Graph): Graph to be compacted
+            in_place (bool, optional): Whether to change graph itself instead of
+                returning a copy. Defaults to False.
+            get_map (bool, optional): Whether to also return the id map. Defaults to False.
+
+        Returns:
+            Graph: Compacted graph, graph itself when in_place
+            Graph, np.ndarray: Compacted graph and old -> new id array, with -1
+                for removed ids, with get_map
+            Bool: False when failed to compact
+        """
         try:
-            Validator.is_graph(graph)
-            new_nodes = {}
-            for new_id, node in enumerate(graph.nodes.values()):
-                node.flag = new_id
-                new_nodes[new_id] = Node(data=node.data)
+            if not isinstance(graph, Graph):
+                error_handler("Only Graph can be compacted", "Type")
+            if not isinstance(in_place, bool):
+                error_handler("in_place is not bool", "Type")
+            with graph.batch() if in_place else graph.read():
+                old_ids, remap = graph._dense_map()
+                new_id_of = remap.tolist()
+
+                owned = graph._owned
+                nodes = {}
+                for new_id, old_id in enumerate(old_ids.tolist()):
+                    node = graph.nodes[old_id]
+                    edges = None
+                    if node.edges:
+                        edges = {new_id_of[target_id]: weight
+                                 for target_id, weight in node.edges.items()}
+                    # Owned nodes are reused in place, shared ones are copied
+                    if in_place and (owned is None or old_id in owned):
+                        node.edges = EMPTY_EDGES if edges is None else edges
+                    else:
+                        node = Node(node.data, node.flag, edges)
+                    nodes[new_id] = node
+
+                if in_place:
+                    result = graph
+                else:
+                    result = Graph(validation=graph.validation,
+                                   journal=graph.journal,
+                                   concurrent=graph.concurrent,
+                                   cache=graph.cache,
+                                   id_policy=graph.id_policy)
+                result.nodes = nodes
+                result.last_id = len(nodes) - 1
+                result._free_ids = []
+                result._owned = None
+                if graph.in_edges is not None:
+                    result.set_reverse_index(True)
+                if graph._in_degree is not None:
+                    result.set_counters(True)
+                if in_place:
+                    result._log_change('compact', result.last_id)
+
+            if get_map:
+                return result, remap
+            return result
+        except:
+            error_handler("Broken graph in compact", "Runtime")
+            return False
 
-            for new_id, node in enumerate(graph.nodes.values()):
-                for eid, weight in node.edges.items():
-                    new_nodes[new_id].edges[graph.nodes[eid].flag] = weight
+    # Builds graph from an edge-list file, streamed in chunks
+    @ staticmethod
+    def edge_file(path: str,
+                  delimiter: str = None,
+                  chunk_size: int = 100_000,
+                  weighted: bool = None,
+                  symmetric: bool = False,
+                  comments: str = '#',
+                  skip_rows: int = 0,
+                  get_labels: bool = False,
+                  weight_dtype=np.float64):
+        """
+        Builds graph from an edge-list file, one "source target [weight]"
+        edge per line. Files ending in .gz are decompressed on the fly
+        Lines are read lazily, chunk_size at a time, and each chunk is parsed
+        with numpy and added in bulk, so only one chunk of raw text is held
+        in memory. Node labels may be any string: they are mapped to dense
+        ids in order of appearance and kept on 'node.data'
+
+        Args:
+            path (str): Edge-list file
+            delimiter (str, optional): Column delimiter. Defaults to tab for .tsv,
+                comma for .csv and whitespace otherwise.
+            chunk_size (int, optional): Lines parsed at a time. Defaults to 100_000.
+            weighted (bool, optional): Whether the third column is the weight.
+                Defaults to None, using it when present. Unweighted edges weigh 0.
+            symmetric (bool, optional): Whether edges are also added as target -> source. Defaults to False.
+            comments (str, optional): Comment line prefix. Defaults to '#'.
+            skip_rows (int, optional): Header lines to skip. Defaults to 0.
+            get_labels (bool, optional): Whether to also return the {label: id} map. Defaults to False.
+            weight_dtype (np.dtype, optional): Type weights are parsed as, the same for
+                every chunk. Defaults to np.float64.
+
+        Returns:
+            Graph: Built graph
+            Tuple[Graph, dict]: Built graph and {label: id} map, with get_labels
+            Bool: False if failed building graph
+        """
+        try:
+            if not isinstance(chunk_size, int) or chunk_size < 1:
+                error_handler("chunk_size is not a positive int", "Value")
+            name = os.fspath(path)
+            base = name[:-3] if name.endswith(".gz") else name
+            if delimiter is None:
+                delimiter = {'.tsv': "\t", '.csv': ","}.get(
+                    os.path.splitext(base)[1].lower())
+            weight_dtype = np.dtype(weight_dtype)
+
+            graph = Graph()
+            labels = {}
+            opener = gzip.open if name.endswith(".gz") else open
+            with opener(name, 'rt') as handle:
+                lines = itertools.islice(handle, skip_rows, None)
+                while True:
+                    chunk = list(itertools.islice(lines, chunk_size))
+                    if not chunk:
+                        break
+                    Builder._add_edge_chunk(graph, chunk, labels, delimiter,
+                                            weighted, symmetric, comments,
+                                            weight_dtype)
+
+            logger.info(f" Edge file is valid. Graph is being built")
+            return (graph, labels) if get_labels else graph
+        except:
+            error_handler("Broken edge file", "Runtime")
+            return False
+
+    # Parses a chunk of edge-list lines into graph
+    @ staticmethod
+    def _add_edge_chunk(graph: Graph, chunk: List[str], labels: dict,
+                        delimiter: str, weighted: bool, symmetric: bool,
+                        comments: str, weight_dtype: np.dtype):
+        """
+        Parses a chunk of edge-list lines with numpy and adds it to graph,
+        allocating ids for unseen labels. Used internally by edge_file
+        """
+        with warnings.catch_warnings():
+            # Chunks of comments only are not an error
+            warnings.simplefilter("ignore", UserWarning)
+            table = np.loadtxt(chunk, dtype=str, delimiter=delimiter,
+                               comments=comments, ndmin=2)
+        if table.size == 0:
+            return
+        columns = table.shape[1]
+        if columns < 2 or (weighted and columns < 3):
+            error_handler("Edge file has too few columns", "Index")
+
+        # Only unique labels of the chunk go through the dict. Row-major
+        # first indices give new labels ids in order of appearance
+        unique, first, inverse = np.unique(table[:, :2].ravel(),
+                                           return_index=True,
+                                           return_inverse=True)
+        new_labels = [(index, label) for index, label
+                      in zip(first.tolist(), unique.tolist())
+                      if label not in labels]
+        if new_labels:
+            new_labels = [label for _, label in sorted(new_labels)]
+            new_ids = graph.add_nodes(data=new_labels)
+            labels.update(zip(new_labels, new_ids))
+        unique_ids = np.fromiter((labels[label] for label in unique.tolist()),
+                                 dtype=np.int64, count=len(unique))
+        ids = unique_ids[inverse.reshape(-1)].reshape(-1, 2)
+
+        weights = 0
+        if columns >= 3 and weighted is not False:
+            weights = table[:, 2].astype(weight_dtype)
+        if not graph.add_edges(ids[:, 0], ids[:, 1], weights,
+                               symmetric=symmetric):
+            error_handler("Edge chunk could not be added", "Runtime")
+
+    # Opens a graph saved by Converter.to_binary
+    @ staticmethod
+    def from_binary(path: str, mmap: bool = True):
+        """
+        Opens a graph saved by Converter.to_binary as a FrozenGraph
+        With mmap, CSR arrays are memory-mapped: opening takes milliseconds
+        and pages are read lazily as they are used. Node data and flags are
+        only unpickled on first access, so only open trusted files
+
+        Args:
+            path (str): Directory written by Converter.to_binary
+            mmap (bool, optional): Whether to memory-map arrays instead of reading them. Defaults to True.
 
-            refac = Graph(new_nodes)
-            return refac
+        Returns:
+            FrozenGraph: Opened graph. Call thaw() for a mutable Graph
+            Bool: False when failed to open
+        """
+        try:
+            with open(os.path.join(path, BINARY_FILES['meta'])) as handle:
+                meta = json.load(handle)
+            if meta.get('format') != BINARY_FORMAT:
+                error_handler("Not a graph binary directory", "Value")
+            if meta.get('version') != BINARY_VERSION:
+                error_handler(f"Unsupported binary version {meta.get('version')}",
+                              "Value")
+
+            mode = 'r' if mmap else None
+            arrays = {name: np.load(os.path.join(path, BINARY_FILES[name]),
+                                    mmap_mode=mode)
+                      for name in ('ids', 'indptr', 'indices', 'weights')}
+            if not mmap:
+                for array in arrays.values():
+                    array.flags.writeable = False
+            if (len(arrays['indptr']) != len(arrays['ids']) + 1
+                    or len(arrays['indices']) != len(arrays['weights'])
+                    or len(arrays['indices']) != meta['num_edges']):
+                error_handler("Binary arrays are inconsistent", "Index")
+
+            nodes_path = os.path.join(path, BINARY_FILES['nodes'])
+
+            def load_nodes():
+                with open(nodes_path, 'rb') as handle:
+                    return pickle.load(handle)
+
+            return FrozenGraph._from_arrays(last_id=meta['last_id'],
+                                            graph_id=meta['graph_id'],
+                                            node_loader=load_nodes,
+                                            **arrays)
         except:
-            error_handler("Broken graph in refactor", "Runtime")
+            error_handler("Broken graph binary", "Runtime")
             return False
 
 # =============================================================================
@@ -745,54 +3908,138 @@ class Converter():
     """
     Converts graphs to native data types for printing, exporting and all
     """
+    # Saves graph in a compact binary directory
+    @ staticmethod
+    @ _reads_graph
+    def to_binary(graph, path: str):
+        """
+        Saves graph in a compact binary directory, opened by Builder.from_binary
+        Holds ids, CSR offsets, targets and weights as .npy arrays, node
+        data and flags as a pickle, and metadata as json
+
+        Args:
+            graph (Graph or FrozenGraph): Graph to be saved
+            path (str): Directory to write. Created when missing
+
+        Returns:
+            Bool: Whether graph was saved
+        """
+        try:
+            if isinstance(graph, Graph):
+                graph = graph.freeze()
+            if not isinstance(graph, FrozenGraph):
+                error_handler("Only graphs can be saved", "Type")
+            os.makedirs(path, exist_ok=True)
+            for name in ('ids', 'indptr', 'indices', 'weights'):
+                np.save(os.path.join(path, BINARY_FILES[name]),
+                        np.ascontiguousarray(getattr(graph, name)))
+            with open(os.path.join(path, BINARY_FILES['nodes']), 'wb') as handle:
+                pickle.dump((graph.data, graph.flags), handle,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            meta = {'format': BINARY_FORMAT,
+                    'version': BINARY_VERSION,
+                    'graph_id': graph.graph_id,
+                    'last_id': graph.last_id,
+                    'num_nodes': len(graph),
+                    'num_edges': graph.num_edges}
+            with open(os.path.join(path, BINARY_FILES['meta']), 'w') as handle:
+                json.dump(meta, handle)
+            return True
+        except:
+            error_handler("Graph could not be saved", "Runtime")
+            return False
+
     # Returns an equivalent adjacency matrix and node data list
     @ staticmethod
-    def to_adjmatrix(graph: Graph, get_nodes=False):
+    @ _cached('to_adjmatrix')
+    def to_adjmatrix(graph: Graph, get_nodes=False, as_array=False,
+                     fill: float = np.nan, dense: bool = False):
         """
         Returns an equivalent adjacency matrix and node data list
+        With as_array, the matrix is a float ndarray filled in a vectorized
+        pass, where fill marks "no edge"
+        With dense, rows and columns are live nodes only, in id order, so
+        removed ids take no space. The id of each position is returned too
 
         Args:
             graph (Graph): Graph to be converted
             get_nodes (bool, optional): Whether to get data list from 'node.data' . Defaults to False.
+            as_array (bool, optional): Whether to return a float ndarray instead of nested lists. Defaults to False.
+            fill (float, optional): Value for missing edges when as_array. Defaults to np.nan.
+            dense (bool, optional): Whether to index by position instead of id. Defaults to False.
 
         Returns:
             adjmatrixtype, list: Resulting adjacency matrix and data list
             adjmatrixtype: Resulting adjacency matrix
+            ..., np.ndarray: Same as above, plus the id of each position, with dense
             Bool: False when failed to convert
         """
         try:
             Validator.is_graph(graph)
             if not isinstance(get_nodes, bool):
                 error_handler("get_nodes is not bool", "Type")
-            adjmatrix = [[None for j in range(0, graph.last_id + 1)]
-                         for i in range(0, graph.last_id + 1)]
-            nodes = [None for i in range(0, graph.last_id + 1)]
-            for source_id, node in graph.nodes.items():
-                nodes[source_id] = node.data
-                for target_id, weight in node.edges.items():
-                    adjmatrix[source_id][target_id] = weight
-
-            if get_nodes:
-                return adjmatrix, nodes
-            return adjmatrix
+            if not isinstance(as_array, bool):
+                error_handler("as_array is not bool", "Type")
+            ids, position = Converter._positions(graph, dense)
+            n = len(ids) if dense else graph.last_id + 1
+            nodes = [None for i in range(0, n)]
+
+            if as_array:
+                num_edges = sum(len(node.edges)
+                                for node in graph.nodes.values())
+                sources = np.fromiter((source_id for source_id, node in graph.nodes.items()
+                                       for _ in node.edges),
+                                      dtype=np.int64, count=num_edges)
+                targets = np.fromiter((target_id for node in graph.nodes.values()
+                                       for target_id in node.edges),
+                                      dtype=np.int64, count=num_edges)
+                weights = np.fromiter((weight for node in graph.nodes.values()
+                                       for weight in node.edges.values()),
+                                      dtype=np.float64, count=num_edges)
+                if dense:
+                    sources, targets = position[sources], position[targets]
+                adjmatrix = np.full((n, n), fill, dtype=np.float64)
+                adjmatrix[sources, targets] = weights
+                if get_nodes:
+                    for source_id, node in graph.nodes.items():
+                        nodes[Converter._at(position, source_id)] = node.data
+            else:
+                position = None if position is None else position.tolist()
+                adjmatrix = [[None for j in range(0, n)]
+                             for i in range(0, n)]
+                for source_id, node in graph.nodes.items():
+                    row = Converter._at(position, source_id)
+                    nodes[row] = node.data
+                    for target_id, weight in node.edges.items():
+                        adjmatrix[row][Converter._at(position, target_id)] = weight
+
+            result = (adjmatrix, nodes) if get_nodes else (adjmatrix,)
+            if dense:
+                result += (ids,)
+            return result if len(result) > 1 else adjmatrix
 
         except:
             error_handler("Wrong parameters in converter", "Runtime")
             return False
 
     @ staticmethod
-    def to_adjlist(graph: Graph, get_nodes=False):
+    @ _cached('to_adjlist')
+    def to_adjlist(graph: Graph, get_nodes=False, dense: bool = False):
         """
         Returns an equivalent adjacency list and node data list
         Edges returned as tuples due to duck typing
+        With dense, rows and edge targets are positions of live nodes, in id
+        order, and the id of each position is returned too
 
         Args:
             graph (Graph): Graph to be converted
             get_nodes (bool, optional): Whether to get data list from 'node.data' . Defaults to False.
+            dense (bool, optional): Whether to index by position instead of id. Defaults to False.
 
         Returns:
             adjlisttype, list: Resulting adjacency list and data list
             adjlisttype: Resulting adjacency list
+            ..., np.ndarray: Same as above, plus the id of each position, with dense
             Bool: False when failed to convert
         """
         try:
@@ -800,52 +4047,229 @@ class Converter():
             if not isinstance(get_nodes, bool):
                 error_handler("get_nodes is not bool", "Type")
 
-            adjlist = [None for i in range(0, graph.last_id + 1)]
-            nodes = [None for i in range(0, graph.last_id + 1)]
+            ids, position = Converter._positions(graph, dense)
+            n = len(ids) if dense else graph.last_id + 1
+            position = None if position is None else position.tolist()
+            adjlist = [None for i in range(0, n)]
+            nodes = [None for i in range(0, n)]
             for id, node in graph.nodes.items():
-                nodes[id] = node.data
-                adjlist[id] = list(node.edges.items())
-            if get_nodes:
-                return adjlist, nodes
-            return adjlist
+                row = Converter._at(position, id)
+                nodes[row] = node.data
+                if dense:
+                    adjlist[row] = [(position[target_id], weight)
+                                    for target_id, weight in node.edges.items()]
+                else:
+                    adjlist[row] = list(node.edges.items())
+
+            result = (adjlist, nodes) if get_nodes else (adjlist,)
+            if dense:
+                result += (ids,)
+            return result if len(result) > 1 else adjlist
 
         except:
             error_handler("Wrong parameters in converter", "Runtime")
             return False
 
     @ staticmethod
-    def to_adjdict(graph: Graph, get_nodes=False):
+    @ _cached('to_adjdict')
+    def to_adjdict(graph: Graph, get_nodes=False, dense: bool = False):
         """
         Returns an equivalent adjacency dict and node data list
+        With dense, keys are positions 0..size - 1 of live nodes, in id
+        order, and the id of each position is returned too
 
         Args:
             graph (Graph): Graph to be converted
             get_nodes (bool, optional): Whether to get data list from 'node.data' . Defaults to False.
+            dense (bool, optional): Whether to key by position instead of id. Defaults to False.
 
         Returns:
             adjdicttype, list: Resulting adjacency dict and data list
             adjdicttype: Resulting adjacency dict
+            ..., np.ndarray: Same as above, plus the id of each position, with dense
             Bool: False when failed to convert
         """
         try:
             Validator.is_graph(graph)
             if not isinstance(get_nodes, bool):
                 error_handler("get_nodes is not bool", "Type")
+            ids, position = Converter._positions(graph, dense)
+            n = len(ids) if dense else graph.last_id + 1
             adjdict = {}
-            nodes = [None for i in range(0, graph.last_id + 1)]
-            for id, node in graph.nodes.items():
-                nodes[id] = node.data
-                adjdict[id] = node.edges
-            if get_nodes:
-                return adjdict, nodes
-            return adjdict
+            nodes = [None for i in range(0, n)]
+            if dense:
+                position = position.tolist()
+                for id in ids.tolist():
+                    node = graph.nodes[id]
+                    nodes[position[id]] = node.data
+                    adjdict[position[id]] = {
+                        position[target_id]: weight
+                        for target_id, weight in node.edges.items()}
+            else:
+                for id, node in graph.nodes.items():
+                    nodes[id] = node.data
+                    adjdict[id] = node.edges
+
+            result = (adjdict, nodes) if get_nodes else (adjdict,)
+            if dense:
+                result += (ids,)
+            return result if len(result) > 1 else adjdict
 
         except:
             error_handler("Wrong parameters in converter", "Runtime")
             return False
 
+    # Live ids and id -> position array for dense outputs
+    @ staticmethod
+    def _positions(graph: Graph, dense: bool):
+        if not isinstance(dense, bool):
+            error_handler("dense is not bool", "Type")
+        if not dense:
+            return None, None
+        return graph._dense_map()
+
+    # Row of id in an output, its position when dense
+    @ staticmethod
+    def _at(position, id):
+        return id if position is None else position[id]
+
+    # Yields (source_id, target_id, weight) triples one at a time
+    @ staticmethod
+    def iter_edges(graph):
+        """
+        Yields (source_id, target_id, weight) triples one at a time, so
+        memory stays constant whatever the graph size
+        The graph must not change while iterating
 
-# =============================================================================
-# Starters
-start_log()
-start_classes()
+        Args:
+            graph (Graph or FrozenGraph): Graph to be exported
+
+        Returns:
+            generator: (source_id, target_id, weight) triples
+            Bool: False when failed to convert
+        """
+        try:
+            rows = Converter._rows(graph)
+            return ((source_id, target_id, weight)
+                    for source_id, edges in rows
+                    for target_id, weight in edges)
+        except:
+            error_handler("Wrong parameters in converter", "Runtime")
+            return False
+
+    # Yields (id, [(target_id, weight), ...]) rows one at a time
+    @ staticmethod
+    def iter_adjlist(graph):
+        """
+        Yields (id, [(target_id, weight), ...]) adjacency rows one at a time
+        Only existing nodes are yielded, so removed ids cost nothing
+        The graph must not change while iterating
+
+        Args:
+            graph (Graph or FrozenGraph): Graph to be exported
+
+        Returns:
+            generator: (id, edge list) rows
+            Bool: False when failed to convert
+        """
+        try:
+            return ((id, list(edges)) for id, edges in Converter._rows(graph))
+        except:
+            error_handler("Wrong parameters in converter", "Runtime")
+            return False
+
+    # Writes graph as "source target weight" lines
+    @ staticmethod
+    def write_edgelist(graph, file, delimiter: str = "\t"):
+        """
+        Streams graph to file as "source target weight" lines, readable
+        by Builder.edge_file. Isolated nodes are not written
+
+        Args:
+            graph (Graph or FrozenGraph): Graph to be exported
+            file (str or file): Path (gzip compressed when ending in .gz) or
+                open text handle, which is left open
+            delimiter (str, optional): Column delimiter. Defaults to tab.
+
+        Returns:
+            Bool: Whether graph was written
+        """
+        try:
+            edges = Converter.iter_edges(graph)
+            if edges is False:
+                error_handler("Graph could not be exported", "Runtime")
+            with Converter._open_output(file) as handle:
+                handle.writelines(
+                    f"{source_id}{delimiter}{target_id}{delimiter}{weight}\n"
+                    for source_id, target_id, weight in edges)
+            return True
+        except:
+            error_handler("Graph could not be written", "Runtime")
+            return False
+
+    # Writes graph as "id target:weight ..." lines
+    @ staticmethod
+    def write_adjlist(graph, file, delimiter: str = " "):
+        """
+        Streams graph to file as one "id target:weight target:weight ..."
+        line per node, isolated nodes included
+
+        Args:
+            graph (Graph or FrozenGraph): Graph to be exported
+            file (str or file): Path (gzip compressed when ending in .gz) or
+                open text handle, which is left open
+            delimiter (str, optional): Field delimiter. Defaults to space.
+
+        Returns:
+            Bool: Whether graph was written
+        """
+        try:
+            rows = Converter._rows(graph)
+            with Converter._open_output(file) as handle:
+                handle.writelines(
+                    delimiter.join([str(id)] + [f"{target_id}:{weight}"
+                                                for target_id, weight in edges])
+                    + "\n"
+                    for id, edges in rows)
+            return True
+        except:
+            error_handler("Graph could not be written", "Runtime")
+            return False
+
+    # Lazy (id, edges) rows of a Graph or FrozenGraph
+    @ staticmethod
+    @ _reads_graph
+    def _rows(graph):
+        """
+        Checks graph and returns a generator of (id, edges) rows, where
+        edges iterates (target_id, weight). Used internally by streaming
+        exporters. On concurrent graphs, rows are read under the read lock
+        """
+        if isinstance(graph, FrozenGraph):
+            def frozen_rows():
+                ids, indptr = graph.ids, graph.indptr
+                for row in range(len(ids)):
+                    start, end = int(indptr[row]), int(indptr[row + 1])
+                    yield int(ids[row]), zip(
+                        ids[graph.indices[start:end]].tolist(),
+                        graph.weights[start:end].tolist())
+            return frozen_rows()
+        Validator.is_graph(graph)
+        # A generator function, so nodes are only iterated once it runs
+        def graph_rows():
+            for id, node in graph.nodes.items():
+                yield id, node.edges.items()
+        rows = graph_rows()
+        if graph._lock is not None:
+            # Holds the read lock until the export is consumed or closed
+            return graph._locked_iter(rows)
+        return rows
+
+    # Opens an output path, or passes an open handle through
+    @ staticmethod
+    def _open_output(file):
+        if isinstance(file, (str, os.PathLike)):
+            name = os.fspath(file)
+            opener = gzip.open if name.endswith(".gz") else open
+            return opener(name, 'wt')
+        return contextlib.nullcontext(file)